@@ -8,19 +8,36 @@ CREATE TABLE IF NOT EXISTS knowledge_base (
     category VARCHAR(50) NOT NULL,
     title VARCHAR(255),
     metadata JSONB DEFAULT '{}',
-    embedding vector(1536),
+    embedding vector(1536) NOT NULL,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Create index for vector similarity search
-CREATE INDEX IF NOT EXISTS knowledge_base_embedding_idx
-ON knowledge_base USING ivfflat (embedding vector_cosine_ops)
-WITH (lists = 100);
+-- Tables created before embedding was NOT NULL: entries without an
+-- embedding could never be found by search, and re-seeding restores them
+DELETE FROM knowledge_base WHERE embedding IS NULL;
+ALTER TABLE knowledge_base ALTER COLUMN embedding SET NOT NULL;
+
+-- Embeddings are stored unit length so searches can use the inner product
+UPDATE knowledge_base SET embedding = l2_normalize(embedding)
+WHERE abs(vector_norm(embedding) - 1) > 1e-4;
+
+-- Create index for vector similarity search over half-precision embeddings
+-- (half the index size; results are reranked on the full-precision column).
+-- Embeddings are unit length, so inner product ranks like cosine distance.
+DROP INDEX IF EXISTS knowledge_base_embedding_idx;
+DROP INDEX IF EXISTS knowledge_base_embedding_half_idx;
+CREATE INDEX IF NOT EXISTS knowledge_base_embedding_half_ip_idx
+ON knowledge_base USING hnsw ((embedding::halfvec(1536)) halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
 
 -- Index for category filtering
 CREATE INDEX IF NOT EXISTS knowledge_base_category_idx ON knowledge_base(category);
 
+-- Covering index for (title, category) lookups used when seeding
+CREATE INDEX IF NOT EXISTS knowledge_base_title_category_idx
+ON knowledge_base(title, category) INCLUDE (id);
+
 -- Interaction logs for analytics
 CREATE TABLE IF NOT EXISTS interaction_logs (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -31,7 +48,7 @@ CREATE TABLE IF NOT EXISTS interaction_logs (
     intent VARCHAR(50),
     complexity VARCHAR(20),
     model_used VARCHAR(50),
-    tools_used JSONB DEFAULT '[]',
+    tools_used JSONB NOT NULL DEFAULT '[]',
     response TEXT,
     tokens_input INTEGER,
     tokens_output INTEGER,
@@ -39,10 +56,21 @@ CREATE TABLE IF NOT EXISTS interaction_logs (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Index for querying by sender
-CREATE INDEX IF NOT EXISTS interaction_logs_sender_idx ON interaction_logs(sender_email);
+-- Backfill tables created before tools_used was NOT NULL
+UPDATE interaction_logs SET tools_used = '[]'
+WHERE tools_used IS NULL OR jsonb_typeof(tools_used) <> 'array';
+ALTER TABLE interaction_logs ALTER COLUMN tools_used SET NOT NULL;
+
+-- Indexes for filtering by sender or intent, newest first
+CREATE INDEX IF NOT EXISTS interaction_logs_sender_created_idx
+    ON interaction_logs(sender_email, created_at);
+CREATE INDEX IF NOT EXISTS interaction_logs_intent_created_idx
+    ON interaction_logs(intent, created_at);
 CREATE INDEX IF NOT EXISTS interaction_logs_created_idx ON interaction_logs(created_at);
 
+-- Covered by interaction_logs_sender_created_idx
+DROP INDEX IF EXISTS interaction_logs_sender_idx;
+
 -- Escalations queue for human review
 CREATE TABLE IF NOT EXISTS escalations (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -56,13 +84,16 @@ CREATE TABLE IF NOT EXISTS escalations (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Index for filtering by status
-CREATE INDEX IF NOT EXISTS escalations_status_idx ON escalations(status);
+-- Index for filtering by status, newest first
+CREATE INDEX IF NOT EXISTS escalations_status_created_idx ON escalations(status, created_at);
+
+-- Covered by escalations_status_created_idx
+DROP INDEX IF EXISTS escalations_status_idx;
 
 -- Response cache for common queries
 CREATE TABLE IF NOT EXISTS response_cache (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    query_hash VARCHAR(64) UNIQUE NOT NULL,
+    query_hash BYTEA UNIQUE NOT NULL,
     query_text TEXT NOT NULL,
     response TEXT NOT NULL,
     intent VARCHAR(50),
@@ -71,5 +102,22 @@ CREATE TABLE IF NOT EXISTS response_cache (
     expires_at TIMESTAMPTZ
 );
 
--- Index for cache lookups
-CREATE INDEX IF NOT EXISTS response_cache_hash_idx ON response_cache(query_hash);
+-- Cache lookups use the unique constraint's index on query_hash
+DROP INDEX IF EXISTS response_cache_hash_idx;
+
+-- Tables created when query_hash held a hex SHA-256 digest: the old keys can
+-- never match a BLAKE2b key, so the (disposable) cached rows are cleared
+-- before the column is converted
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'response_cache'
+            AND column_name = 'query_hash'
+            AND data_type <> 'bytea'
+    ) THEN
+        DELETE FROM response_cache;
+        ALTER TABLE response_cache
+            ALTER COLUMN query_hash TYPE BYTEA USING decode(query_hash, 'hex');
+    END IF;
+END $$;
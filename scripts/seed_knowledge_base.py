@@ -2,19 +2,60 @@
 """Seed the knowledge base with FAQ and policy content."""
 
 import asyncio
-import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
 from pathlib import Path
+from uuid import uuid4
+
+import ijson
+import numpy as np
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.config import get_settings
-from support_agent.integrations.database.connection import get_db_session
+from support_agent.integrations.database.connection import get_db_session, register_vector_codec
 from support_agent.integrations.database.models import KnowledgeBase
 from support_agent.services.embedding import EmbeddingService
 
-
-async def load_json_file(file_path: Path) -> list[dict]:
-    """Load JSON data from file."""
-    with open(file_path, "r") as f:
-        return json.load(f)
+# Entries per embeddings request / commit (OpenAI accepts up to 2048 inputs)
+BATCH_SIZE = 500
+
+KNOWLEDGE_BASE_COLUMNS = [
+    "id",
+    "content",
+    "category",
+    "title",
+    "metadata",
+    "embedding",
+    "created_at",
+    "updated_at",
+]
+
+
+async def iter_json_entries(file_path: Path) -> AsyncIterator[dict]:
+    """Stream entries from a JSON array file one at a time."""
+    with open(file_path, "rb") as f:
+        for entry in ijson.items(f, "item", use_float=True):
+            yield entry
+
+
+async def copy_knowledge_base_rows(db: AsyncSession, records: list[tuple]) -> None:
+    """Bulk insert knowledge base rows with PostgreSQL COPY.
+
+    Runs on the session's own connection so the rows are committed with
+    the surrounding transaction.
+    """
+    # COPY binds embeddings with pgvector's binary codec
+    await register_vector_codec(db)
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    asyncpg_connection = raw_connection.driver_connection
+    await asyncpg_connection.copy_records_to_table(
+        KnowledgeBase.__tablename__,
+        records=records,
+        columns=KNOWLEDGE_BASE_COLUMNS,
+    )
 
 
 async def seed_knowledge_base():
@@ -35,45 +76,55 @@ async def seed_knowledge_base():
     total_entries = 0
 
     async with get_db_session() as db:
+        # Load existing (title, category) keys once instead of probing per entry
+        existing = await db.execute(select(KnowledgeBase.title, KnowledgeBase.category))
+        existing_keys = {(row.title, row.category) for row in existing.all()}
+
+        pending: list[dict] = []
+
         for file_path in data_files:
             if not file_path.exists():
                 print(f"Warning: {file_path} not found, skipping...")
                 continue
 
             print(f"\nProcessing {file_path.name}...")
-            entries = await load_json_file(file_path)
-
-            for entry in entries:
+            async for entry in iter_json_entries(file_path):
                 # Check if entry already exists (by title and category)
-                from sqlalchemy import select
-
-                existing = await db.execute(
-                    select(KnowledgeBase).where(
-                        KnowledgeBase.title == entry.get("title"),
-                        KnowledgeBase.category == entry["category"],
-                    )
-                )
-                if existing.scalar_one_or_none():
+                key = (entry.get("title"), entry["category"])
+                if key in existing_keys:
                     print(f"  Skipping existing: {entry.get('title', 'Untitled')}")
                     continue
-
-                # Generate embedding for the content
-                print(f"  Generating embedding for: {entry.get('title', 'Untitled')}")
-                embedding = await embedding_service.embed_text(entry["content"])
-
-                # Create knowledge base entry
-                kb_entry = KnowledgeBase(
-                    content=entry["content"],
-                    category=entry["category"],
-                    title=entry.get("title"),
-                    extra_data=entry.get("metadata", {}),
-                    embedding=embedding,
+                existing_keys.add(key)
+                pending.append(entry)
+
+        # Generate embeddings in batches and commit each batch
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = pending[start : start + BATCH_SIZE]
+            print(f"\nGenerating embeddings for {len(batch)} entries...")
+            embeddings = await embedding_service.embed_texts(
+                [entry["content"] for entry in batch]
+            )
+            # Searches rank by inner product, which needs unit-length vectors
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+            now = datetime.now(timezone.utc)
+            records = [
+                (
+                    uuid4(),
+                    entry["content"],
+                    entry["category"],
+                    entry.get("title"),
+                    orjson.dumps(entry.get("metadata", {})).decode(),
+                    embedding,
+                    now,
+                    now,
                 )
+                for entry, embedding in zip(batch, embeddings)
+            ]
 
-                db.add(kb_entry)
-                total_entries += 1
-
-        await db.commit()
+            await copy_knowledge_base_rows(db, records)
+            await db.commit()
+            total_entries += len(records)
 
     print(f"\nSeeding complete! Added {total_entries} entries to knowledge base.")
 
@@ -3,16 +3,31 @@
 
 import asyncio
 import json
+import os
+import sys
 
 from support_agent.agent.core import SupportAgent
 from support_agent.integrations.database.connection import get_db_session
 
+# Set VERBOSE=0 to suppress per-test output
+VERBOSE = os.getenv("VERBOSE", "1") != "0"
+
+# Limit in-flight tests to stay under the OpenAI rate limit
+MAX_CONCURRENCY = 4
+
+
+def report(lines: list[str]) -> None:
+    """Write a test's output in one call so concurrent tests don't interleave."""
+    if VERBOSE:
+        sys.stdout.write("\n".join(lines) + "\n")
+
 
 async def test_order_status():
     """Test order status inquiry."""
-    print("\n" + "=" * 60)
-    print("TEST 1: Order Status Inquiry")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 1: Order Status Inquiry")
+    lines.append("=" * 60)
 
     async with get_db_session() as db:
         agent = SupportAgent(db)
@@ -23,20 +38,23 @@ async def test_order_status():
             sender_name="John Doe",
         )
 
-        print(f"\nIntent: {response.classification.intent.value}")
-        print(f"Complexity: {response.classification.complexity.value}")
-        print(f"Model Used: {response.model_used}")
-        print(f"Tools Used: {response.tools_used}")
-        print(f"Response Time: {response.response_time_ms}ms")
-        print(f"Tokens: {response.tokens_input} in, {response.tokens_output} out")
-        print(f"\n--- Response ---\n{response.response_text}")
+        lines.append(f"\nIntent: {response.classification.intent.value}")
+        lines.append(f"Complexity: {response.classification.complexity.value}")
+        lines.append(f"Model Used: {response.model_used}")
+        lines.append(f"Tools Used: {response.tools_used}")
+        lines.append(f"Response Time: {response.response_time_ms}ms")
+        lines.append(f"Tokens: {response.tokens_input} in, {response.tokens_output} out")
+        lines.append(f"\n--- Response ---\n{response.response_text}")
+
+    report(lines)
 
 
 async def test_return_policy():
     """Test return policy question."""
-    print("\n" + "=" * 60)
-    print("TEST 2: Return Policy Question")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 2: Return Policy Question")
+    lines.append("=" * 60)
 
     async with get_db_session() as db:
         agent = SupportAgent(db)
@@ -46,19 +64,22 @@ async def test_return_policy():
             sender_email="customer@example.com",
         )
 
-        print(f"\nIntent: {response.classification.intent.value}")
-        print(f"Complexity: {response.classification.complexity.value}")
-        print(f"Model Used: {response.model_used}")
-        print(f"Tools Used: {response.tools_used}")
-        print(f"Response Time: {response.response_time_ms}ms")
-        print(f"\n--- Response ---\n{response.response_text}")
+        lines.append(f"\nIntent: {response.classification.intent.value}")
+        lines.append(f"Complexity: {response.classification.complexity.value}")
+        lines.append(f"Model Used: {response.model_used}")
+        lines.append(f"Tools Used: {response.tools_used}")
+        lines.append(f"Response Time: {response.response_time_ms}ms")
+        lines.append(f"\n--- Response ---\n{response.response_text}")
+
+    report(lines)
 
 
 async def test_shipping_tracking():
     """Test shipping tracking inquiry."""
-    print("\n" + "=" * 60)
-    print("TEST 3: Shipping Tracking")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 3: Shipping Tracking")
+    lines.append("=" * 60)
 
     async with get_db_session() as db:
         agent = SupportAgent(db)
@@ -69,19 +90,22 @@ async def test_shipping_tracking():
             sender_name="Jane Smith",
         )
 
-        print(f"\nIntent: {response.classification.intent.value}")
-        print(f"Complexity: {response.classification.complexity.value}")
-        print(f"Model Used: {response.model_used}")
-        print(f"Tools Used: {response.tools_used}")
-        print(f"Response Time: {response.response_time_ms}ms")
-        print(f"\n--- Response ---\n{response.response_text}")
+        lines.append(f"\nIntent: {response.classification.intent.value}")
+        lines.append(f"Complexity: {response.classification.complexity.value}")
+        lines.append(f"Model Used: {response.model_used}")
+        lines.append(f"Tools Used: {response.tools_used}")
+        lines.append(f"Response Time: {response.response_time_ms}ms")
+        lines.append(f"\n--- Response ---\n{response.response_text}")
+
+    report(lines)
 
 
 async def test_customer_orders():
     """Test customer order history lookup."""
-    print("\n" + "=" * 60)
-    print("TEST 4: Customer Order History")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 4: Customer Order History")
+    lines.append("=" * 60)
 
     async with get_db_session() as db:
         agent = SupportAgent(db)
@@ -92,19 +116,22 @@ async def test_customer_orders():
             sender_name="John Doe",
         )
 
-        print(f"\nIntent: {response.classification.intent.value}")
-        print(f"Complexity: {response.classification.complexity.value}")
-        print(f"Model Used: {response.model_used}")
-        print(f"Tools Used: {response.tools_used}")
-        print(f"Response Time: {response.response_time_ms}ms")
-        print(f"\n--- Response ---\n{response.response_text}")
+        lines.append(f"\nIntent: {response.classification.intent.value}")
+        lines.append(f"Complexity: {response.classification.complexity.value}")
+        lines.append(f"Model Used: {response.model_used}")
+        lines.append(f"Tools Used: {response.tools_used}")
+        lines.append(f"Response Time: {response.response_time_ms}ms")
+        lines.append(f"\n--- Response ---\n{response.response_text}")
+
+    report(lines)
 
 
 async def test_escalation():
     """Test escalation request."""
-    print("\n" + "=" * 60)
-    print("TEST 5: Escalation Request")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 5: Escalation Request")
+    lines.append("=" * 60)
 
     async with get_db_session() as db:
         agent = SupportAgent(db)
@@ -114,12 +141,20 @@ async def test_escalation():
             sender_email="angry@example.com",
         )
 
-        print(f"\nIntent: {response.classification.intent.value}")
-        print(f"Complexity: {response.classification.complexity.value}")
-        print(f"Escalated: {response.escalated}")
-        print(f"Escalation Reason: {response.escalation_reason}")
-        print(f"Response Time: {response.response_time_ms}ms")
-        print(f"\n--- Response ---\n{response.response_text}")
+        lines.append(f"\nIntent: {response.classification.intent.value}")
+        lines.append(f"Complexity: {response.classification.complexity.value}")
+        lines.append(f"Escalated: {response.escalated}")
+        lines.append(f"Escalation Reason: {response.escalation_reason}")
+        lines.append(f"Response Time: {response.response_time_ms}ms")
+        lines.append(f"\n--- Response ---\n{response.response_text}")
+
+    report(lines)
+
+
+async def run_limited(semaphore: asyncio.Semaphore, test):
+    """Run a test coroutine function once a concurrency slot is free."""
+    async with semaphore:
+        return await test()
 
 
 async def main():
@@ -128,11 +163,20 @@ async def main():
     print("# Support Agent Test Suite")
     print("#" * 60)
 
-    await test_order_status()
-    await test_return_policy()
-    await test_shipping_tracking()
-    await test_customer_orders()
-    await test_escalation()
+    # Tests are independent, so run them concurrently
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    await asyncio.gather(
+        *(
+            run_limited(semaphore, test)
+            for test in (
+                test_order_status,
+                test_return_policy,
+                test_shipping_tracking,
+                test_customer_orders,
+                test_escalation,
+            )
+        )
+    )
 
     print("\n" + "#" * 60)
     print("# All tests completed!")
@@ -3,31 +3,55 @@
 
 import asyncio
 import json
+import os
 import sys
 
 import httpx
 
 BASE_URL = "http://localhost:8000"
 
+# Set VERBOSE=0 to suppress per-test output
+VERBOSE = os.getenv("VERBOSE", "1") != "0"
 
-async def test_health():
+# Limit in-flight requests to stay under the OpenAI rate limit
+MAX_CONCURRENCY = 4
+
+
+def report(lines: list[str]) -> None:
+    """Write a test's output in one call so concurrent tests don't interleave."""
+    if VERBOSE:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+async def run_limited(
+    semaphore: asyncio.Semaphore, test, client: httpx.AsyncClient
+) -> bool:
+    """Run a test coroutine function once a concurrency slot is free."""
+    async with semaphore:
+        return await test(client)
+
+
+async def test_health(client: httpx.AsyncClient):
     """Test health endpoint."""
-    print("\n" + "=" * 60)
-    print("TEST: Health Check")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: Health Check")
+    lines.append("=" * 60)
+
+    response = await client.get("/api/v1/health")
+    lines.append(f"Status: {response.status_code}")
+    lines.append(f"Response: {json.dumps(response.json(), indent=2)}")
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/api/v1/health")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+    report(lines)
+    return response.status_code == 200
 
 
-async def test_email_processing():
+async def test_email_processing(client: httpx.AsyncClient):
     """Test email processing endpoint."""
-    print("\n" + "=" * 60)
-    print("TEST: Email Processing - Order Status")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: Email Processing - Order Status")
+    lines.append("=" * 60)
 
     payload = {
         "from": "john.doe@example.com",
@@ -36,30 +60,32 @@ async def test_email_processing():
         "sender_name": "John Doe",
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/email/process",
-            json=payload,
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Intent: {data.get('intent')}")
-        print(f"Complexity: {data.get('complexity')}")
-        print(f"Tools Used: {data.get('tools_used')}")
-        print(f"Model: {data.get('model_used')}")
-        print(f"Response Time: {data.get('response_time_ms')}ms")
-        print(f"Tokens: {data.get('tokens')}")
-        print(f"Escalated: {data.get('escalated')}")
-        print(f"Interaction ID: {data.get('interaction_id')}")
-        print(f"\n--- Response ---\n{data.get('response_text')}")
-        return response.status_code == 200
-
-
-async def test_email_return_policy():
+    response = await client.post(
+        "/api/v1/email/process",
+        json=payload,
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Intent: {data.get('intent')}")
+    lines.append(f"Complexity: {data.get('complexity')}")
+    lines.append(f"Tools Used: {data.get('tools_used')}")
+    lines.append(f"Model: {data.get('model_used')}")
+    lines.append(f"Response Time: {data.get('response_time_ms')}ms")
+    lines.append(f"Tokens: {data.get('tokens')}")
+    lines.append(f"Escalated: {data.get('escalated')}")
+    lines.append(f"Interaction ID: {data.get('interaction_id')}")
+    lines.append(f"\n--- Response ---\n{data.get('response_text')}")
+
+    report(lines)
+    return response.status_code == 200
+
+
+async def test_email_return_policy(client: httpx.AsyncClient):
     """Test email processing with return policy question."""
-    print("\n" + "=" * 60)
-    print("TEST: Email Processing - Return Policy")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: Email Processing - Return Policy")
+    lines.append("=" * 60)
 
     payload = {
         "from": "customer@example.com",
@@ -67,28 +93,30 @@ async def test_email_return_policy():
         "body": "What is your return policy? Can I return an item I bought 2 weeks ago?",
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/email/process",
-            json=payload,
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Intent: {data.get('intent')}")
-        print(f"Complexity: {data.get('complexity')}")
-        print(f"Tools Used: {data.get('tools_used')}")
-        print(f"Model: {data.get('model_used')}")
-        print(f"Response Time: {data.get('response_time_ms')}ms")
-        print(f"Escalated: {data.get('escalated')}")
-        print(f"\n--- Response ---\n{data.get('response_text')}")
-        return response.status_code == 200
-
-
-async def test_email_escalation():
+    response = await client.post(
+        "/api/v1/email/process",
+        json=payload,
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Intent: {data.get('intent')}")
+    lines.append(f"Complexity: {data.get('complexity')}")
+    lines.append(f"Tools Used: {data.get('tools_used')}")
+    lines.append(f"Model: {data.get('model_used')}")
+    lines.append(f"Response Time: {data.get('response_time_ms')}ms")
+    lines.append(f"Escalated: {data.get('escalated')}")
+    lines.append(f"\n--- Response ---\n{data.get('response_text')}")
+
+    report(lines)
+    return response.status_code == 200
+
+
+async def test_email_escalation(client: httpx.AsyncClient):
     """Test email processing with escalation request."""
-    print("\n" + "=" * 60)
-    print("TEST: Email Processing - Escalation Request")
-    print("=" * 60)
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: Email Processing - Escalation Request")
+    lines.append("=" * 60)
 
     payload = {
         "from": "angry@example.com",
@@ -96,90 +124,94 @@ async def test_email_escalation():
         "body": "This is ridiculous! I've been waiting for my refund for 3 weeks. I demand to speak to a supervisor immediately!",
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/email/process",
-            json=payload,
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Intent: {data.get('intent')}")
-        print(f"Complexity: {data.get('complexity')}")
-        print(f"Escalated: {data.get('escalated')}")
-        print(f"Escalation Reason: {data.get('escalation_reason')}")
-        print(f"\n--- Response ---\n{data.get('response_text')}")
-        return response.status_code == 200
-
-
-async def test_list_interactions():
-    """Test listing interactions."""
-    print("\n" + "=" * 60)
-    print("TEST: List Interactions")
-    print("=" * 60)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/api/v1/admin/interactions",
-            params={"limit": 5},
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Total: {data.get('total')}")
-        print(f"Showing: {len(data.get('interactions', []))}")
-
-        for i, interaction in enumerate(data.get("interactions", [])[:3], 1):
-            print(f"\n  [{i}] {interaction.get('id')[:8]}...")
-            print(f"      From: {interaction.get('sender_email')}")
-            print(f"      Subject: {interaction.get('subject')}")
-            print(f"      Intent: {interaction.get('intent')}")
+    response = await client.post(
+        "/api/v1/email/process",
+        json=payload,
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Intent: {data.get('intent')}")
+    lines.append(f"Complexity: {data.get('complexity')}")
+    lines.append(f"Escalated: {data.get('escalated')}")
+    lines.append(f"Escalation Reason: {data.get('escalation_reason')}")
+    lines.append(f"\n--- Response ---\n{data.get('response_text')}")
 
-        return response.status_code == 200
+    report(lines)
+    return response.status_code == 200
 
 
-async def test_list_escalations():
+async def test_list_interactions(client: httpx.AsyncClient):
+    """Test listing interactions."""
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: List Interactions")
+    lines.append("=" * 60)
+
+    response = await client.get(
+        "/api/v1/admin/interactions",
+        params={"limit": 5},
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Total: {data.get('total')}")
+    lines.append(f"Showing: {len(data.get('interactions', []))}")
+
+    for i, interaction in enumerate(data.get("interactions", [])[:3], 1):
+        lines.append(f"\n  [{i}] {interaction.get('id')[:8]}...")
+        lines.append(f"      From: {interaction.get('sender_email')}")
+        lines.append(f"      Subject: {interaction.get('subject')}")
+        lines.append(f"      Intent: {interaction.get('intent')}")
+
+    report(lines)
+    return response.status_code == 200
+
+
+async def test_list_escalations(client: httpx.AsyncClient):
     """Test listing escalations."""
-    print("\n" + "=" * 60)
-    print("TEST: List Escalations")
-    print("=" * 60)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/api/v1/admin/escalations",
-            params={"limit": 5},
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Total: {data.get('total')}")
-        print(f"Showing: {len(data.get('escalations', []))}")
-
-        for i, esc in enumerate(data.get("escalations", [])[:3], 1):
-            print(f"\n  [{i}] {esc.get('id')[:8]}...")
-            print(f"      Status: {esc.get('status')}")
-            print(f"      Reason: {esc.get('reason')[:50]}...")
-
-        return response.status_code == 200
-
-
-async def test_filter_by_email():
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: List Escalations")
+    lines.append("=" * 60)
+
+    response = await client.get(
+        "/api/v1/admin/escalations",
+        params={"limit": 5},
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Total: {data.get('total')}")
+    lines.append(f"Showing: {len(data.get('escalations', []))}")
+
+    for i, esc in enumerate(data.get("escalations", [])[:3], 1):
+        lines.append(f"\n  [{i}] {esc.get('id')[:8]}...")
+        lines.append(f"      Status: {esc.get('status')}")
+        lines.append(f"      Reason: {esc.get('reason')[:50]}...")
+
+    report(lines)
+    return response.status_code == 200
+
+
+async def test_filter_by_email(client: httpx.AsyncClient):
     """Test filtering interactions by sender email."""
-    print("\n" + "=" * 60)
-    print("TEST: Filter Interactions by Sender Email")
-    print("=" * 60)
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/api/v1/admin/interactions",
-            params={"sender_email": "john.doe@example.com", "limit": 5},
-        )
-        print(f"Status: {response.status_code}")
-        data = response.json()
-        print(f"Total matching: {data.get('total')}")
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST: Filter Interactions by Sender Email")
+    lines.append("=" * 60)
+
+    response = await client.get(
+        "/api/v1/admin/interactions",
+        params={"sender_email": "john.doe@example.com", "limit": 5},
+    )
+    lines.append(f"Status: {response.status_code}")
+    data = response.json()
+    lines.append(f"Total matching: {data.get('total')}")
 
-        for i, interaction in enumerate(data.get("interactions", [])[:3], 1):
-            print(f"\n  [{i}] Subject: {interaction.get('subject')}")
-            print(f"      Intent: {interaction.get('intent')}")
+    for i, interaction in enumerate(data.get("interactions", [])[:3], 1):
+        lines.append(f"\n  [{i}] Subject: {interaction.get('subject')}")
+        lines.append(f"      Intent: {interaction.get('intent')}")
 
-        return response.status_code == 200
+    report(lines)
+    return response.status_code == 200
 
 
 async def main():
@@ -189,19 +221,41 @@ async def main():
     print("#" * 60)
 
     results = []
-
-    # Test health first
-    results.append(("Health Check", await test_health()))
-
-    # Test email processing
-    results.append(("Email - Order Status", await test_email_processing()))
-    results.append(("Email - Return Policy", await test_email_return_policy()))
-    results.append(("Email - Escalation", await test_email_escalation()))
-
-    # Test admin endpoints
-    results.append(("List Interactions", await test_list_interactions()))
-    results.append(("List Escalations", await test_list_escalations()))
-    results.append(("Filter by Email", await test_filter_by_email()))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    # One pooled client shared by all tests (HTTP/2 is used when the server supports it)
+    client = httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+    async with client:
+        # Test health first
+        results.append(("Health Check", await test_health(client)))
+
+        # Test email processing (independent requests, run concurrently)
+        email_tests = [
+            ("Email - Order Status", test_email_processing),
+            ("Email - Return Policy", test_email_return_policy),
+            ("Email - Escalation", test_email_escalation),
+        ]
+        passed = await asyncio.gather(
+            *(run_limited(semaphore, test, client) for _, test in email_tests)
+        )
+        results.extend(zip([name for name, _ in email_tests], passed))
+
+        # Test admin endpoints (after processing so the new records are listed)
+        admin_tests = [
+            ("List Interactions", test_list_interactions),
+            ("List Escalations", test_list_escalations),
+            ("Filter by Email", test_filter_by_email),
+        ]
+        passed = await asyncio.gather(
+            *(run_limited(semaphore, test, client) for _, test in admin_tests)
+        )
+        results.extend(zip([name for name, _ in admin_tests], passed))
 
     # Summary
     print("\n" + "#" * 60)
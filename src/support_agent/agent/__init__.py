@@ -1,7 +1,13 @@
 """Agent module for customer support email processing."""
 
 from support_agent.agent.core import SupportAgent
-from support_agent.agent.classifier import IntentClassifier
-from support_agent.agent.router import ModelRouter
+from support_agent.agent.classifier import IntentClassifier, get_intent_classifier
+from support_agent.agent.router import ModelRouter, get_model_router
 
-__all__ = ["SupportAgent", "IntentClassifier", "ModelRouter"]
+__all__ = [
+    "SupportAgent",
+    "IntentClassifier",
+    "get_intent_classifier",
+    "ModelRouter",
+    "get_model_router",
+]
@@ -1,11 +1,16 @@
 """Intent classification for customer emails."""
 
-import json
+import hashlib
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+
+import orjson
 
 from support_agent.config import get_settings
-from support_agent.integrations.openai_client import OpenAIClient
+from support_agent.integrations.openai_client import OpenAIClient, get_openai_client
 
 
 class Intent(str, Enum):
@@ -30,7 +35,12 @@ class Complexity(str, Enum):
     COMPLEX = "complex"  # Requires reasoning, multiple steps, or escalation
 
 
-@dataclass
+# Value -> member lookups; unknown values from the model fall back to defaults
+_INTENT_BY_VALUE = {intent.value: intent for intent in Intent}
+_COMPLEXITY_BY_VALUE = {complexity.value: complexity for complexity in Complexity}
+
+
+@dataclass(slots=True, frozen=True)
 class ClassificationResult:
     """Result from intent classification."""
 
@@ -84,6 +94,142 @@ Complexity guidelines:
 
 Respond ONLY with the JSON object, no other text."""
 
+# Constant prompt chunks around the {subject}, {body} and {sender_email} slots,
+# split once so classify() can concatenate instead of re-parsing the template.
+_PROMPT_HEAD, _rest = CLASSIFICATION_PROMPT.split("{subject}")
+_PROMPT_AFTER_SUBJECT, _rest = _rest.split("{body}")
+_PROMPT_AFTER_BODY, _PROMPT_TAIL = _rest.split("{sender_email}")
+del _rest
+
+# Returned when the classifier output cannot be parsed
+_FALLBACK_RESULT = ClassificationResult(
+    intent=Intent.GENERAL_INQUIRY,
+    complexity=Complexity.MEDIUM,
+    confidence=0.5,
+    requires_order_lookup=False,
+    requires_knowledge_base=True,
+    suggested_tools=["search_knowledge_base"],
+    reasoning="Failed to parse classification, defaulting to general inquiry",
+)
+
+# Structured output schema so the model always returns parseable JSON
+CLASSIFICATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "classification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "intent": {"type": "string", "enum": [i.value for i in Intent]},
+                "complexity": {"type": "string", "enum": [c.value for c in Complexity]},
+                "confidence": {"type": "number"},
+                "requires_order_lookup": {"type": "boolean"},
+                "requires_knowledge_base": {"type": "boolean"},
+                "suggested_tools": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": [
+                            "search_knowledge_base",
+                            "get_order",
+                            "get_fulfillment",
+                            "get_customer_orders",
+                            "escalate_to_human",
+                        ],
+                    },
+                },
+                "reasoning": {"type": "string"},
+            },
+            "required": [
+                "intent",
+                "complexity",
+                "confidence",
+                "requires_order_lookup",
+                "requires_knowledge_base",
+                "suggested_tools",
+                "reasoning",
+            ],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+@dataclass
+class PrefilterRule:
+    """Keyword rule that classifies an email without an LLM call."""
+
+    intent: Intent
+    complexity: Complexity
+    pattern: re.Pattern[str]
+    requires_order_lookup: bool
+    requires_knowledge_base: bool
+    suggested_tools: list[str]
+
+
+# High-precision phrases that map directly to an intent. Emails matching rules
+# for more than one intent are left to the LLM.
+PREFILTER_RULES = [
+    PrefilterRule(
+        intent=Intent.ESCALATION_REQUEST,
+        complexity=Complexity.COMPLEX,
+        pattern=re.compile(
+            r"\b(?:speak|talk) (?:to|with) (?:a |an |the |your )?"
+            r"(?:manager|supervisor|human|real person)\b|\bhuman agent\b"
+        ),
+        requires_order_lookup=False,
+        requires_knowledge_base=False,
+        suggested_tools=["escalate_to_human"],
+    ),
+    PrefilterRule(
+        intent=Intent.SHIPPING_TRACKING,
+        complexity=Complexity.SIMPLE,
+        pattern=re.compile(
+            r"\btracking (?:number|info|information|link)\b"
+            r"|\btrack my (?:order|package|parcel|shipment)\b"
+        ),
+        requires_order_lookup=True,
+        requires_knowledge_base=False,
+        suggested_tools=["get_fulfillment"],
+    ),
+    PrefilterRule(
+        intent=Intent.ORDER_STATUS,
+        complexity=Complexity.SIMPLE,
+        pattern=re.compile(r"\bwhere(?:'s| is) my (?:order|package|parcel)\b|\border status\b"),
+        requires_order_lookup=True,
+        requires_knowledge_base=False,
+        suggested_tools=["get_order", "get_customer_orders"],
+    ),
+    PrefilterRule(
+        intent=Intent.POLICY_QUESTION,
+        complexity=Complexity.SIMPLE,
+        pattern=re.compile(r"\b(?:return|refund|exchange|shipping|privacy|warranty) policy\b"),
+        requires_order_lookup=False,
+        requires_knowledge_base=True,
+        suggested_tools=["search_knowledge_base"],
+    ),
+]
+
+# Negative sentiment that should go through the LLM so complaints are not
+# routed as simple lookups. Refunds only count when demanded, so questions
+# about the refund policy can still be answered by the prefilter.
+_COMPLAINT_RE = re.compile(
+    r"\b(?:ridiculous|unacceptable|terrible|awful|furious|angry|disappointed|"
+    r"complaint|lawyer|legal action|worst|scam|"
+    r"refund (?:now|immediately)|want (?:a|my) refund)\b"
+)
+
+# LLM classifications keyed by a digest of (subject, body), shared by all
+# classifier instances. The sender is left out so identical questions from
+# different customers share an entry.
+_CLASSIFICATION_CACHE: OrderedDict[bytes, ClassificationResult] = OrderedDict()
+
+
+def _classification_cache_key(subject: str, body: str) -> bytes:
+    """Build the classification cache key for an email."""
+    return hashlib.blake2b(f"{subject}\x1f{body}".encode(), digest_size=16).digest()
+
 
 class IntentClassifier:
     """Classifies customer email intent and complexity."""
@@ -95,7 +241,36 @@ class IntentClassifier:
             openai_client: OpenAI client instance.
         """
         self.settings = get_settings()
-        self.client = openai_client or OpenAIClient()
+        self.client = openai_client or get_openai_client()
+
+    def prefilter(self, subject: str, body: str) -> ClassificationResult | None:
+        """Classify unambiguous emails by keyword without calling the LLM.
+
+        Args:
+            subject: Email subject line.
+            body: Email body text.
+
+        Returns:
+            ClassificationResult if exactly one intent matches, otherwise None.
+        """
+        text = f"{subject}\n{body}".lower()
+        matches = [rule for rule in PREFILTER_RULES if rule.pattern.search(text)]
+        if len(matches) != 1:
+            return None
+
+        rule = matches[0]
+        if rule.intent != Intent.ESCALATION_REQUEST and _COMPLAINT_RE.search(text):
+            return None
+
+        return ClassificationResult(
+            intent=rule.intent,
+            complexity=rule.complexity,
+            confidence=0.95,
+            requires_order_lookup=rule.requires_order_lookup,
+            requires_knowledge_base=rule.requires_knowledge_base,
+            suggested_tools=list(rule.suggested_tools),
+            reasoning=f"Matched keyword rule for {rule.intent.value}",
+        )
 
     async def classify(
         self,
@@ -113,45 +288,67 @@ class IntentClassifier:
         Returns:
             ClassificationResult with intent, complexity, and suggested tools.
         """
-        prompt = CLASSIFICATION_PROMPT.format(
-            subject=subject,
-            body=body,
-            sender_email=sender_email,
+        if self.settings.classifier_prefilter_enabled:
+            prefiltered = self.prefilter(subject, body)
+            if prefiltered is not None:
+                return prefiltered
+
+        cache_key = _classification_cache_key(subject, body)
+        cached = _CLASSIFICATION_CACHE.get(cache_key)
+        if cached is not None:
+            _CLASSIFICATION_CACHE.move_to_end(cache_key)
+            return cached
+
+        result = await self._classify_with_llm(subject, body, sender_email)
+        if result is None:
+            return _FALLBACK_RESULT
+
+        if self.settings.classifier_cache_size > 0:
+            _CLASSIFICATION_CACHE[cache_key] = result
+            if len(_CLASSIFICATION_CACHE) > self.settings.classifier_cache_size:
+                _CLASSIFICATION_CACHE.popitem(last=False)
+        return result
+
+    async def _classify_with_llm(
+        self,
+        subject: str,
+        body: str,
+        sender_email: str,
+    ) -> ClassificationResult | None:
+        """Classify an email with the classifier model.
+
+        Args:
+            subject: Email subject line.
+            body: Email body text.
+            sender_email: Sender's email address.
+
+        Returns:
+            ClassificationResult, or None if the model output could not be parsed.
+        """
+        prompt = (
+            f"{_PROMPT_HEAD}{subject}{_PROMPT_AFTER_SUBJECT}{body}"
+            f"{_PROMPT_AFTER_BODY}{sender_email}{_PROMPT_TAIL}"
         )
 
         response = await self.client.chat_completion(
             messages=[{"role": "user", "content": prompt}],
             model=self.settings.classifier_model,
             temperature=0.1,  # Low temperature for consistent classification
+            max_tokens=256,  # Classification JSON is well under this
+            response_format=CLASSIFICATION_RESPONSE_FORMAT,
         )
 
-        # Parse JSON response
-        content = response.choices[0].message.content.strip()
-
-        # Handle potential markdown code blocks
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            content = content.strip()
+        # Parse JSON response (empty on refusal, truncated if max_tokens is hit)
+        content = response.choices[0].message.content or ""
 
         try:
-            result = json.loads(content)
-        except json.JSONDecodeError:
-            # Fallback classification
-            return ClassificationResult(
-                intent=Intent.GENERAL_INQUIRY,
-                complexity=Complexity.MEDIUM,
-                confidence=0.5,
-                requires_order_lookup=False,
-                requires_knowledge_base=True,
-                suggested_tools=["search_knowledge_base"],
-                reasoning="Failed to parse classification, defaulting to general inquiry",
-            )
+            result = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return None
 
         return ClassificationResult(
-            intent=Intent(result.get("intent", "general_inquiry")),
-            complexity=Complexity(result.get("complexity", "medium")),
+            intent=_INTENT_BY_VALUE.get(result.get("intent"), Intent.GENERAL_INQUIRY),
+            complexity=_COMPLEXITY_BY_VALUE.get(result.get("complexity"), Complexity.MEDIUM),
             confidence=float(result.get("confidence", 0.8)),
             requires_order_lookup=bool(result.get("requires_order_lookup", False)),
             requires_knowledge_base=bool(result.get("requires_knowledge_base", True)),
@@ -176,3 +373,9 @@ class IntentClassifier:
         if classification.confidence < 0.5:
             return True
         return False
+
+
+@lru_cache
+def get_intent_classifier() -> IntentClassifier:
+    """Get the shared process-wide intent classifier."""
+    return IntentClassifier()
@@ -1,15 +1,25 @@
 """Main agent orchestrator for customer support."""
 
-import json
+import asyncio
+import contextlib
+import re
 import time
-from dataclasses import dataclass, field
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field, replace
 from typing import Any
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from support_agent.agent.classifier import ClassificationResult, IntentClassifier
+from support_agent.agent.classifier import (
+    ClassificationResult,
+    Complexity,
+    Intent,
+    IntentClassifier,
+    get_intent_classifier,
+)
 from support_agent.agent.prompts import get_agent_system_prompt, get_email_context_prompt
-from support_agent.agent.router import ModelRouter
+from support_agent.agent.router import ModelConfig, get_model_router
 from support_agent.agent.tools.base import ToolRegistry, ToolResult
 from support_agent.agent.tools.escalation import EscalateToHumanTool
 from support_agent.agent.tools.knowledge_base import SearchKnowledgeBaseTool
@@ -18,11 +28,45 @@ from support_agent.agent.tools.shopify import (
     GetFulfillmentTool,
     GetOrderTool,
 )
-from support_agent.integrations.openai_client import OpenAIClient
-from support_agent.integrations.shopify.mock import MockShopifyClient
+from support_agent.config import get_settings
+from support_agent.integrations.openai_client import OpenAIClient, get_openai_client
+from support_agent.integrations.shopify.mock import MockShopifyClient, get_shopify_client
+from support_agent.services.semantic_cache import (
+    SemanticResponseCache,
+    get_semantic_response_cache,
+)
 
+# Intents whose responses are never served from the semantic cache
+UNCACHEABLE_INTENTS = {Intent.COMPLAINT, Intent.REFUND_REQUEST, Intent.ESCALATION_REQUEST}
 
-@dataclass
+# Reason and priority recorded for each intent that escalates before the LLM
+IMMEDIATE_ESCALATIONS = {
+    intent: (
+        f"Immediate escalation: {intent.value}",
+        "high" if intent == Intent.COMPLAINT else "medium",
+    )
+    for intent in Intent
+}
+
+# Intents answered from a single knowledge base search when classified SIMPLE
+FAST_PATH_INTENTS = {Intent.POLICY_QUESTION, Intent.PRODUCT_QUESTION}
+
+# Maximum LLM calls in the agent loop before giving up
+MAX_ITERATIONS = 5
+
+# Maximum tool calls from one assistant turn that run at the same time
+MAX_CONCURRENT_TOOLS = 5
+
+# Tools whose results are not customer-specific, so responses built only from
+# them are safe to reuse for other customers
+CACHEABLE_TOOLS = {"search_knowledge_base"}
+
+# Order numbers, long numbers and email addresses: emails mentioning them are
+# about specific orders or accounts, which a similar-looking email may not share
+_PERSONAL_DETAILS_RE = re.compile(r"#\s*\d+|\b\d{4,}\b|[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+@dataclass(slots=True, frozen=True)
 class AgentResponse:
     """Response from the support agent."""
 
@@ -38,14 +82,54 @@ class AgentResponse:
     escalation_reason: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConversationMessage:
     """A message in the conversation."""
 
     role: str  # "system", "user", "assistant", "tool"
     content: str
     tool_call_id: str | None = None
-    tool_calls: list[dict] | None = None
+    tool_calls: list[tuple[str, str, str]] | None = None  # (id, name, arguments)
+
+    def to_dict(self) -> dict:
+        """Convert to an OpenAI chat message."""
+        message = {"role": self.role, "content": self.content}
+        if self.tool_call_id is not None:
+            message["tool_call_id"] = self.tool_call_id
+        if self.tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": name, "arguments": arguments},
+                }
+                for call_id, name, arguments in self.tool_calls
+            ]
+        return message
+
+
+@dataclass
+class _AgentRun:
+    """State carried through the agent loop for one email."""
+
+    classification: ClassificationResult
+    model_config: ModelConfig
+    messages: list[ConversationMessage]
+    payload: list[dict]  # messages in OpenAI wire format
+    cache_embedding: Any = None
+    cache_key: str | None = None
+    speculative_task: asyncio.Task | None = None
+    speculative_model: str | None = None
+    fast_path: bool = False
+    tools_used: list[str] = field(default_factory=list)
+    tool_results: list[dict] = field(default_factory=list)
+    tokens_input: int = 0
+    tokens_output: int = 0
+
+    def add_message(self, message: ConversationMessage) -> None:
+        """Append a message to the conversation and its wire payload."""
+        self.messages.append(message)
+        self.payload.append(message.to_dict())
 
 
 class SupportAgent:
@@ -56,6 +140,7 @@ class SupportAgent:
         db: AsyncSession,
         openai_client: OpenAIClient | None = None,
         shopify_client: MockShopifyClient | None = None,
+        response_cache: SemanticResponseCache | None = None,
     ):
         """Initialize the support agent.
 
@@ -63,14 +148,27 @@ class SupportAgent:
             db: Database session for tools.
             openai_client: OpenAI client instance.
             shopify_client: Shopify client instance.
+            response_cache: Semantic response cache (defaults to the shared
+                cache when enabled in settings).
         """
         self.db = db
-        self.openai_client = openai_client or OpenAIClient()
-        self.shopify_client = shopify_client or MockShopifyClient()
-
-        # Initialize components
-        self.classifier = IntentClassifier(self.openai_client)
-        self.router = ModelRouter()
+        self.settings = get_settings()
+        self.openai_client = openai_client or get_openai_client()
+        self.shopify_client = shopify_client or get_shopify_client()
+        if response_cache is None and self.settings.semantic_cache_enabled:
+            response_cache = get_semantic_response_cache()
+        self.response_cache = response_cache
+
+        # Tools run concurrently, but the ones sharing the database session
+        # must not overlap (AsyncSession is not safe for concurrent use)
+        self._tool_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+        self._db_lock = asyncio.Lock()
+
+        # Stateless components are shared across requests
+        self.classifier = (
+            IntentClassifier(openai_client) if openai_client else get_intent_classifier()
+        )
+        self.router = get_model_router()
 
         # Initialize tool registry
         self.tool_registry = ToolRegistry()
@@ -82,7 +180,14 @@ class SupportAgent:
         self.tool_registry.register(GetOrderTool(self.shopify_client))
         self.tool_registry.register(GetFulfillmentTool(self.shopify_client))
         self.tool_registry.register(GetCustomerOrdersTool(self.shopify_client))
-        self.tool_registry.register(EscalateToHumanTool(self.db))
+        self._escalation_tool = EscalateToHumanTool(self.db)
+        self.tool_registry.register(self._escalation_tool)
+
+        # Both are fixed once tools are registered, so build them once
+        self._tools_schema = self.tool_registry.get_openai_tools_schema()
+        self._system_message = ConversationMessage(
+            role="system", content=get_agent_system_prompt()
+        )
 
     async def process_email(
         self,
@@ -102,19 +207,241 @@ class SupportAgent:
         Returns:
             AgentResponse with the generated response and metadata.
         """
-        start_time = time.time()
-        tools_used: list[str] = []
-        tool_results: list[dict] = []
-
-        # Step 1: Classify intent and complexity
-        classification = await self.classifier.classify(
-            subject=subject,
-            body=body,
-            sender_email=sender_email,
-        )
+        start_ns = time.perf_counter_ns()
+        run = await self._start_run(subject, body, sender_email, sender_name, start_ns)
+        if isinstance(run, AgentResponse):
+            return run
+        if run.fast_path:
+            return await self._simple_fast_path(run, subject, body, sender_name, start_ns)
+
+        # Step 5: Run agent loop with tool calls
+        for iteration in range(MAX_ITERATIONS):
+            # Call LLM with tools, reusing the speculative first call if kept
+            model = run.model_config.model
+            if run.speculative_task is not None:
+                response = await run.speculative_task
+                run.speculative_task = None
+                model = run.speculative_model
+            else:
+                response = await self.openai_client.chat_completion(
+                    messages=run.payload,
+                    model=run.model_config.model,
+                    temperature=run.model_config.temperature,
+                    max_tokens=run.model_config.max_tokens,
+                    tools=self._tools_schema,
+                )
 
-        # Step 2: Check for immediate escalation
+            # Track token usage
+            if response.usage:
+                run.tokens_input += response.usage.prompt_tokens
+                run.tokens_output += response.usage.completion_tokens
+
+            assistant_message = response.choices[0].message
+
+            # Check if model wants to use tools
+            if assistant_message.tool_calls:
+                escalation = await self._run_tool_calls(
+                    run,
+                    assistant_message.content,
+                    [
+                        (tc.id, tc.function.name, tc.function.arguments)
+                        for tc in assistant_message.tool_calls
+                    ],
+                    start_ns,
+                )
+                if escalation is not None:
+                    return escalation
+            else:
+                # No tool calls, we have the final response
+                return self._finish_run(run, assistant_message.content, start_ns, model)
+
+        return await self._escalate_max_iterations(run, subject, body, sender_email, start_ns)
+
+    async def process_email_stream(
+        self,
+        subject: str,
+        body: str,
+        sender_email: str,
+        sender_name: str | None = None,
+    ) -> AsyncIterator[str | AgentResponse]:
+        """Process a customer support email, streaming the response text.
+
+        Text deltas are yielded as the model generates them, followed by the
+        final AgentResponse. Cache hits and escalations yield only the
+        AgentResponse, whose response_text is authoritative in all cases.
+
+        Args:
+            subject: Email subject.
+            body: Email body text.
+            sender_email: Customer's email address.
+            sender_name: Customer's name if known.
+
+        Yields:
+            Response text deltas, then the AgentResponse.
+        """
+        start_ns = time.perf_counter_ns()
+        run = await self._start_run(subject, body, sender_email, sender_name, start_ns)
+        if isinstance(run, AgentResponse):
+            yield run
+            return
+        if run.fast_path:
+            response = await self._simple_fast_path(run, subject, body, sender_name, start_ns)
+            yield response.response_text
+            yield response
+            return
+
+        for iteration in range(MAX_ITERATIONS):
+            model = run.model_config.model
+            if run.speculative_task is not None:
+                # The speculative first call was not streamed
+                response = await run.speculative_task
+                run.speculative_task = None
+                model = run.speculative_model
+                if response.usage:
+                    run.tokens_input += response.usage.prompt_tokens
+                    run.tokens_output += response.usage.completion_tokens
+                assistant_message = response.choices[0].message
+                content = assistant_message.content
+                tool_calls = [
+                    (tc.id, tc.function.name, tc.function.arguments)
+                    for tc in assistant_message.tool_calls or []
+                ]
+                if content and not tool_calls:
+                    yield content
+            else:
+                stream = await self.openai_client.stream_chat_completion(
+                    messages=run.payload,
+                    model=run.model_config.model,
+                    temperature=run.model_config.temperature,
+                    max_tokens=run.model_config.max_tokens,
+                    tools=self._tools_schema,
+                )
+                content_parts: list[str] = []
+                # Tool calls arrive in fragments keyed by their index
+                partial_calls: dict[int, list[str]] = {}
+                async for chunk in stream:
+                    if chunk.usage:
+                        run.tokens_input += chunk.usage.prompt_tokens
+                        run.tokens_output += chunk.usage.completion_tokens
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield delta.content
+                    for tc in delta.tool_calls or []:
+                        call = partial_calls.setdefault(tc.index, ["", "", ""])
+                        if tc.id:
+                            call[0] = tc.id
+                        if tc.function and tc.function.name:
+                            call[1] += tc.function.name
+                        if tc.function and tc.function.arguments:
+                            call[2] += tc.function.arguments
+                content = "".join(content_parts)
+                tool_calls = [tuple(partial_calls[index]) for index in sorted(partial_calls)]
+
+            if tool_calls:
+                escalation = await self._run_tool_calls(run, content, tool_calls, start_ns)
+                if escalation is not None:
+                    yield escalation
+                    return
+            else:
+                yield self._finish_run(run, content, start_ns, model)
+                return
+
+        yield await self._escalate_max_iterations(run, subject, body, sender_email, start_ns)
+
+    async def _start_run(
+        self,
+        subject: str,
+        body: str,
+        sender_email: str,
+        sender_name: str | None,
+        start_ns: int,
+    ) -> AgentResponse | _AgentRun:
+        """Run the steps before the agent loop.
+
+        Args:
+            subject: Email subject.
+            body: Email body text.
+            sender_email: Customer's email address.
+            sender_name: Customer's name if known.
+            start_ns: Processing start time from time.perf_counter_ns().
+
+        Returns:
+            A finished AgentResponse for cache hits and immediate escalations,
+            otherwise the state for the agent loop.
+        """
+        classification: ClassificationResult | None = None
+
+        # Step 0: Serve near-duplicate emails from the semantic cache
+        cache_embedding = None
+        cache_key = self._response_cache_key(subject, body, sender_email)
+        if self.response_cache and cache_key is not None:
+            cache_embedding = await self.response_cache.embed(subject, body)
+            match = self.response_cache.lookup(cache_embedding, cache_key)
+            if match:
+                similarity, cached = match
+                if similarity >= self.settings.semantic_cache_threshold:
+                    return self._cached_response(cached, cached.classification, start_ns)
+                if similarity >= self.settings.semantic_cache_verify_threshold:
+                    # Gray zone: only reuse the response if the intent agrees
+                    classification = await self.classifier.classify(
+                        subject=subject,
+                        body=body,
+                        sender_email=sender_email,
+                    )
+                    if classification.intent == cached.classification.intent:
+                        return self._cached_response(cached, classification, start_ns)
+
+        # Step 1: Build conversation with system prompt
+        messages = [
+            self._system_message,
+            ConversationMessage(
+                role="user",
+                content=get_email_context_prompt(
+                    subject=subject,
+                    body=body,
+                    sender_email=sender_email,
+                    sender_name=sender_name,
+                ),
+            ),
+        ]
+
+        # Step 2: Classify intent and complexity, speculatively starting the
+        # first LLM call on the medium tier while the classifier runs
+        payload = self._to_openai_payload(messages)
+        speculative_config = self.router.tiers[Complexity.MEDIUM]
+        speculative_task = None
+        if classification is None:
+            if self.settings.speculative_generation_enabled:
+                speculative_task = asyncio.create_task(
+                    self.openai_client.chat_completion(
+                        messages=list(payload),
+                        model=speculative_config.model,
+                        temperature=speculative_config.temperature,
+                        max_tokens=speculative_config.max_tokens,
+                        tools=self._tools_schema,
+                    )
+                )
+            try:
+                classification = await self.classifier.classify(
+                    subject=subject,
+                    body=body,
+                    sender_email=sender_email,
+                )
+            except BaseException:
+                if speculative_task is not None:
+                    await self._discard_speculative_call(speculative_task)
+                raise
+
+        # Step 3: Check for immediate escalation
         if self.classifier.should_escalate(classification):
+            tokens_input = tokens_output = 0
+            if speculative_task is not None:
+                tokens_input, tokens_output = await self._discard_speculative_call(
+                    speculative_task
+                )
             escalation_result = await self._handle_immediate_escalation(
                 classification=classification,
                 sender_email=sender_email,
@@ -127,133 +454,383 @@ class SupportAgent:
                 tools_used=["escalate_to_human"],
                 tool_results=[escalation_result],
                 model_used="none",
-                tokens_input=0,
-                tokens_output=0,
-                response_time_ms=int((time.time() - start_time) * 1000),
+                tokens_input=tokens_input,
+                tokens_output=tokens_output,
+                response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
                 escalated=True,
                 escalation_reason=classification.reasoning,
             )
 
-        # Step 3: Get model configuration based on complexity
+        # Step 4: Get model configuration based on complexity. The speculative
+        # call is only discarded when the email needs the complex tier or
+        # takes the single-call fast path; otherwise it answers the first turn
+        # and later turns run on the routed tier.
         model_config = self.router.get_model_config(
             complexity=classification.complexity,
             intent=classification.intent,
         )
+        fast_path = (
+            classification.complexity == Complexity.SIMPLE
+            and classification.intent in FAST_PATH_INTENTS
+        )
+        tokens_input = tokens_output = 0
+        if speculative_task is not None and (
+            fast_path or model_config is self.router.tiers[Complexity.COMPLEX]
+        ):
+            tokens_input, tokens_output = await self._discard_speculative_call(speculative_task)
+            speculative_task = None
+
+        return _AgentRun(
+            classification=classification,
+            model_config=model_config,
+            messages=messages,
+            payload=payload,
+            cache_embedding=cache_embedding,
+            cache_key=cache_key,
+            speculative_task=speculative_task,
+            speculative_model=speculative_config.model,
+            fast_path=fast_path,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+        )
 
-        # Step 4: Build conversation with system prompt
-        messages = [
-            {"role": "system", "content": get_agent_system_prompt()},
-            {
-                "role": "user",
-                "content": get_email_context_prompt(
-                    subject=subject,
-                    body=body,
-                    sender_email=sender_email,
-                    sender_name=sender_name,
-                ),
-            },
-        ]
+    @staticmethod
+    async def _discard_speculative_call(task: asyncio.Task) -> tuple[int, int]:
+        """Cancel a speculative LLM call and report what it was billed.
 
-        # Step 5: Run agent loop with tool calls
-        total_input_tokens = 0
-        total_output_tokens = 0
-        max_iterations = 5  # Prevent infinite loops
-
-        for iteration in range(max_iterations):
-            # Call LLM with tools
-            response = await self.openai_client.chat_completion(
-                messages=messages,
-                model=model_config.model,
-                temperature=model_config.temperature,
-                max_tokens=model_config.max_tokens,
-                tools=self.tool_registry.get_openai_tools_schema(),
-            )
+        Args:
+            task: The speculative chat completion task.
 
-            # Track token usage
-            if response.usage:
-                total_input_tokens += response.usage.prompt_tokens
-                total_output_tokens += response.usage.completion_tokens
+        Returns:
+            Tuple of (input tokens, output tokens) if the call had already
+            finished, otherwise zeros.
+        """
+        task.cancel()
+        # Retrieve the outcome so a failed call is not logged as unhandled
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
+        if task.cancelled() or task.exception() is not None:
+            return 0, 0
+        usage = task.result().usage
+        return (usage.prompt_tokens, usage.completion_tokens) if usage else (0, 0)
+
+    async def _simple_fast_path(
+        self,
+        run: _AgentRun,
+        subject: str,
+        body: str,
+        sender_name: str | None,
+        start_ns: int,
+    ) -> AgentResponse:
+        """Answer a simple knowledge base question with one LLM call.
 
-            assistant_message = response.choices[0].message
+        The knowledge base is searched directly and the results are inlined
+        into the user message, skipping the tool-calling round trip.
 
-            # Check if model wants to use tools
-            if assistant_message.tool_calls:
-                # Add assistant message to conversation
-                messages.append({
-                    "role": "assistant",
-                    "content": assistant_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in assistant_message.tool_calls
-                    ],
+        Args:
+            run: Agent loop state.
+            subject: Email subject.
+            body: Email body text.
+            sender_name: Customer's name if known.
+            start_ns: Processing start time from time.perf_counter_ns().
+
+        Returns:
+            AgentResponse with the generated response and metadata.
+        """
+        tool_args = {"query": f"{subject} {body[:200]}"}
+        payload = (await self._execute_tool("search_knowledge_base", tool_args)).to_dict()
+        run.tools_used.append("search_knowledge_base")
+        run.tool_results.append({
+            "tool": "search_knowledge_base",
+            "args": tool_args,
+            "result": payload,
+        })
+
+        user_message = run.messages[1]
+        run.messages[1] = ConversationMessage(
+            role="user",
+            content=(
+                f"{user_message.content}\n\n### Knowledge base results\n"
+                f"{orjson.dumps(payload).decode()}"
+            ),
+        )
+        run.payload = self._to_openai_payload(run.messages)
+
+        response = await self.openai_client.chat_completion(
+            messages=run.payload,
+            model=run.model_config.model,
+            temperature=run.model_config.temperature,
+            max_tokens=run.model_config.max_tokens,
+        )
+        if response.usage:
+            run.tokens_input += response.usage.prompt_tokens
+            run.tokens_output += response.usage.completion_tokens
+
+        return self._finish_run(run, response.choices[0].message.content, start_ns)
+
+    async def _run_tool_calls(
+        self,
+        run: _AgentRun,
+        content: str | None,
+        tool_calls: list[tuple[str, str, str]],
+        start_ns: int,
+    ) -> AgentResponse | None:
+        """Execute the tool calls from one assistant turn.
+
+        Args:
+            run: Agent loop state, updated in place.
+            content: Assistant message text accompanying the tool calls.
+            tool_calls: (call id, tool name, JSON arguments) per tool call.
+            start_ns: Processing start time from time.perf_counter_ns().
+
+        Returns:
+            AgentResponse if the agent escalated to a human, otherwise None.
+        """
+        # Add assistant message to conversation
+        run.add_message(
+            ConversationMessage(role="assistant", content=content or "", tool_calls=tool_calls)
+        )
+
+        # Parse arguments for all tool calls up front
+        parsed_calls = []
+        for call_id, tool_name, arguments in tool_calls:
+            try:
+                tool_args = orjson.loads(arguments)
+            except orjson.JSONDecodeError:
+                tool_args = {}
+            parsed_calls.append((call_id, tool_name, tool_args))
+
+        # Escalation ends the turn, so run it before the other tools
+        results: dict[int, ToolResult] = {}
+        for index, (call_id, tool_name, tool_args) in enumerate(parsed_calls):
+            if tool_name != "escalate_to_human":
+                continue
+            result = await self._execute_tool(tool_name, tool_args)
+            if result.success:
+                run.tools_used.append(tool_name)
+                run.tool_results.append({
+                    "tool": tool_name,
+                    "args": tool_args,
+                    "result": result.to_dict(),
                 })
+                return AgentResponse(
+                    response_text=result.data.get("message", "Escalated to human agent."),
+                    classification=run.classification,
+                    tools_used=run.tools_used,
+                    tool_results=run.tool_results,
+                    model_used=run.model_config.model,
+                    tokens_input=run.tokens_input,
+                    tokens_output=run.tokens_output,
+                    response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                    escalated=True,
+                    escalation_reason=tool_args.get("reason", "Agent escalation"),
+                )
+            results[index] = result
+
+        # Remaining tool calls are independent, so run them concurrently
+        pending = [index for index in range(len(parsed_calls)) if index not in results]
+        outcomes = await asyncio.gather(
+            *(
+                self._execute_tool(parsed_calls[index][1], parsed_calls[index][2])
+                for index in pending
+            ),
+            return_exceptions=True,
+        )
+        for index, outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = ToolResult(success=False, error=str(outcome))
+            results[index] = outcome
+
+        # Record results in the original call order
+        for index, (call_id, tool_name, tool_args) in enumerate(parsed_calls):
+            payload = results[index].to_dict()
+            run.tools_used.append(tool_name)
+            run.tool_results.append({
+                "tool": tool_name,
+                "args": tool_args,
+                "result": payload,
+            })
+
+            # Add tool result to conversation
+            run.add_message(
+                ConversationMessage(
+                    role="tool",
+                    content=orjson.dumps(payload).decode(),
+                    tool_call_id=call_id,
+                )
+            )
+        return None
 
-                # Execute each tool call
-                for tool_call in assistant_message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tools_used.append(tool_name)
-
-                    try:
-                        tool_args = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError:
-                        tool_args = {}
-
-                    # Execute tool
-                    result = await self.tool_registry.execute(tool_name, **tool_args)
-                    tool_results.append({
-                        "tool": tool_name,
-                        "args": tool_args,
-                        "result": result.to_dict(),
-                    })
-
-                    # Check for escalation
-                    if tool_name == "escalate_to_human" and result.success:
-                        return AgentResponse(
-                            response_text=result.data.get("message", "Escalated to human agent."),
-                            classification=classification,
-                            tools_used=tools_used,
-                            tool_results=tool_results,
-                            model_used=model_config.model,
-                            tokens_input=total_input_tokens,
-                            tokens_output=total_output_tokens,
-                            response_time_ms=int((time.time() - start_time) * 1000),
-                            escalated=True,
-                            escalation_reason=tool_args.get("reason", "Agent escalation"),
-                        )
-
-                    # Add tool result to conversation
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(result.to_dict()),
-                    })
-            else:
-                # No tool calls, we have the final response
-                response_text = assistant_message.content or "I apologize, I was unable to generate a response."
-                break
+    def _finish_run(
+        self,
+        run: _AgentRun,
+        content: str | None,
+        start_ns: int,
+        model: str | None = None,
+    ) -> AgentResponse:
+        """Build the final response and store it in the semantic cache.
+
+        Args:
+            run: Agent loop state.
+            content: Final assistant message text.
+            start_ns: Processing start time from time.perf_counter_ns().
+            model: Model that wrote the final message (defaults to the
+                routed tier's model).
+
+        Returns:
+            AgentResponse with the generated response and metadata.
+        """
+        agent_response = AgentResponse(
+            response_text=content or "I apologize, I was unable to generate a response.",
+            classification=run.classification,
+            tools_used=run.tools_used,
+            tool_results=run.tool_results,
+            model_used=model or run.model_config.model,
+            tokens_input=run.tokens_input,
+            tokens_output=run.tokens_output,
+            response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+        )
+
+        if (
+            content  # Never cache the fallback message
+            and run.cache_embedding is not None
+            and run.cache_key is not None
+            and run.classification.intent not in UNCACHEABLE_INTENTS
+            and set(run.tools_used) <= CACHEABLE_TOOLS
+        ):
+            self.response_cache.add(run.cache_embedding, run.cache_key, agent_response)
+
+        return agent_response
+
+    @staticmethod
+    def _response_cache_key(subject: str, body: str, sender_email: str) -> str | None:
+        """Get the semantic cache key for an email.
+
+        Replies are personalised and may echo details from the email, so
+        entries are only reused for the same sender. Emails mentioning order
+        numbers or email addresses are not cached at all, since a similar
+        email can differ from them in exactly those details.
+
+        Args:
+            subject: Email subject.
+            body: Email body text.
+            sender_email: Customer's email address.
+
+        Returns:
+            Normalized sender address, or None if the email must not be cached.
+        """
+        key = sender_email.strip().lower()
+        if not key or _PERSONAL_DETAILS_RE.search(subject) or _PERSONAL_DETAILS_RE.search(body):
+            return None
+        return key
+
+    @staticmethod
+    def _to_openai_payload(messages: list[ConversationMessage]) -> list[dict]:
+        """Convert conversation messages to the OpenAI wire format.
+
+        Args:
+            messages: Conversation so far.
+
+        Returns:
+            List of message dicts for the chat completions API.
+        """
+        return [message.to_dict() for message in messages]
+
+    async def _execute_tool(self, name: str, args: dict) -> ToolResult:
+        """Execute a tool, serializing tools that use the database session.
+
+        Args:
+            name: Tool name.
+            args: Parsed tool arguments.
+
+        Returns:
+            ToolResult from tool execution.
+        """
+        tool = self.tool_registry.get(name)
+        async with self._tool_semaphore:
+            if tool is not None and tool.uses_db_session:
+                async with self._db_lock:
+                    return await self.tool_registry.execute(name, **args)
+            return await self.tool_registry.execute(name, **args)
+
+    def _cached_response(
+        self,
+        cached: AgentResponse,
+        classification: ClassificationResult,
+        start_ns: int,
+    ) -> AgentResponse:
+        """Build a response for a semantic cache hit.
+
+        Args:
+            cached: Cached agent response.
+            classification: Classification to report for this email.
+            start_ns: Processing start time from time.perf_counter_ns().
+
+        Returns:
+            Copy of the cached response with per-request fields reset.
+        """
+        return replace(
+            cached,
+            classification=classification,
+            tools_used=[],
+            tool_results=[],
+            model_used="cache",
+            tokens_input=0,
+            tokens_output=0,
+            response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+        )
+
+    async def _escalate_max_iterations(
+        self,
+        run: _AgentRun,
+        subject: str,
+        body: str,
+        sender_email: str,
+        start_ns: int,
+    ) -> AgentResponse:
+        """Escalate an email the agent loop could not resolve.
+
+        Args:
+            run: Agent loop state.
+            subject: Email subject.
+            body: Email body text.
+            sender_email: Customer's email address.
+            start_ns: Processing start time from time.perf_counter_ns().
+
+        Returns:
+            AgentResponse, escalated unless creating the escalation failed.
+        """
+        tool_args = {
+            "reason": "agent_max_iterations_reached",
+            "priority": "medium",
+            "customer_email": sender_email,
+            "summary": f"Subject: {subject}\n\nBody: {body[:500]}",
+        }
+        result = await self._escalation_tool.execute(**tool_args)
+        if result.success:
+            response_text = result.data["message"]
+            run.tools_used.append("escalate_to_human")
+            run.tool_results.append({
+                "tool": "escalate_to_human",
+                "args": tool_args,
+                "result": result.to_dict(),
+            })
         else:
-            # Max iterations reached
             response_text = (
                 "I apologize, but I'm having difficulty processing your request. "
                 "Your inquiry has been forwarded to our support team for assistance."
             )
-
         return AgentResponse(
             response_text=response_text,
-            classification=classification,
-            tools_used=tools_used,
-            tool_results=tool_results,
-            model_used=model_config.model,
-            tokens_input=total_input_tokens,
-            tokens_output=total_output_tokens,
-            response_time_ms=int((time.time() - start_time) * 1000),
+            classification=run.classification,
+            tools_used=run.tools_used,
+            tool_results=run.tool_results,
+            model_used=run.model_config.model,
+            tokens_input=run.tokens_input,
+            tokens_output=run.tokens_output,
+            response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+            escalated=result.success,
+            escalation_reason="max_iterations" if result.success else None,
         )
 
     async def _handle_immediate_escalation(
@@ -274,10 +851,10 @@ class SupportAgent:
         Returns:
             Escalation result dictionary.
         """
-        escalation_tool = EscalateToHumanTool(self.db)
-        result = await escalation_tool.execute(
-            reason=f"Immediate escalation: {classification.intent.value}",
-            priority="high" if classification.intent.value == "complaint" else "medium",
+        reason, priority = IMMEDIATE_ESCALATIONS[classification.intent]
+        result = await self._escalation_tool.execute(
+            reason=reason,
+            priority=priority,
             customer_email=sender_email,
             summary=f"Subject: {subject}\n\nBody: {body[:500]}",
         )
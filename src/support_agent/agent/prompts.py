@@ -1,5 +1,7 @@
 """System prompts for the support agent."""
 
+from functools import lru_cache
+
 SYSTEM_PROMPT = """You are a helpful customer support agent for an e-commerce store.
 Your goal is to assist customers with their inquiries professionally and accurately.
 
@@ -87,6 +89,7 @@ Customer Support
 ---"""
 
 
+@lru_cache(maxsize=2)
 def get_agent_system_prompt(include_format: bool = True) -> str:
     """Get the full system prompt for the agent.
 
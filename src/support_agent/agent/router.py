@@ -1,12 +1,28 @@
 """Tiered LLM routing based on query complexity."""
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 
 from support_agent.agent.classifier import Complexity, Intent
 from support_agent.config import get_settings
 
+# Numeric rank per complexity (higher = more complex)
+_COMPLEXITY_RANKS: Mapping[Complexity, int] = MappingProxyType({
+    Complexity.SIMPLE: 1,
+    Complexity.MEDIUM: 2,
+    Complexity.COMPLEX: 3,
+})
 
-@dataclass
+# Approximate pricing per 1K tokens (as of late 2024)
+_MODEL_PRICING: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    "gpt-4o-mini": MappingProxyType({"input": 0.00015, "output": 0.0006}),
+    "gpt-4o": MappingProxyType({"input": 0.0025, "output": 0.01}),
+})
+
+
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """Configuration for a specific model tier."""
 
@@ -24,7 +40,7 @@ class ModelRouter:
         self.settings = get_settings()
 
         # Define model tiers
-        self.tiers = {
+        self.tiers: Mapping[Complexity, ModelConfig] = MappingProxyType({
             Complexity.SIMPLE: ModelConfig(
                 model=self.settings.simple_model,
                 max_tokens=500,
@@ -43,14 +59,24 @@ class ModelRouter:
                 temperature=0.7,
                 description="Advanced model for complex reasoning and escalations",
             ),
-        }
+        })
 
         # Intent-based overrides (some intents always need specific tiers)
-        self.intent_overrides = {
+        self.intent_overrides: Mapping[Intent, Complexity] = MappingProxyType({
             Intent.COMPLAINT: Complexity.COMPLEX,
             Intent.REFUND_REQUEST: Complexity.COMPLEX,
             Intent.ESCALATION_REQUEST: Complexity.COMPLEX,
-        }
+        })
+
+        # Resolve every (intent, complexity) pair up front so routing is a
+        # single lookup
+        self._resolved: Mapping[tuple[Intent | None, Complexity], ModelConfig] = (
+            MappingProxyType({
+                (intent, complexity): self._resolve(complexity, intent)
+                for intent in (*Intent, None)
+                for complexity in Complexity
+            })
+        )
 
     def get_model_config(
         self,
@@ -59,6 +85,18 @@ class ModelRouter:
     ) -> ModelConfig:
         """Get model configuration for given complexity and intent.
 
+        Args:
+            complexity: Query complexity level.
+            intent: Optional intent for override checking.
+
+        Returns:
+            ModelConfig for the appropriate tier.
+        """
+        return self._resolved[(intent, complexity)]
+
+    def _resolve(self, complexity: Complexity, intent: Intent | None) -> ModelConfig:
+        """Apply intent overrides to pick the tier for a query.
+
         Args:
             complexity: Query complexity level.
             intent: Optional intent for override checking.
@@ -84,12 +122,7 @@ class ModelRouter:
         Returns:
             Numeric rank (higher = more complex).
         """
-        ranks = {
-            Complexity.SIMPLE: 1,
-            Complexity.MEDIUM: 2,
-            Complexity.COMPLEX: 3,
-        }
-        return ranks.get(complexity, 2)
+        return _COMPLEXITY_RANKS.get(complexity, 2)
 
     def estimate_cost(self, complexity: Complexity, input_tokens: int) -> dict:
         """Estimate cost for a query at given complexity.
@@ -101,14 +134,8 @@ class ModelRouter:
         Returns:
             Cost estimate dictionary.
         """
-        # Approximate pricing (as of late 2024)
-        pricing = {
-            "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},  # per 1K tokens
-            "gpt-4o": {"input": 0.0025, "output": 0.01},
-        }
-
         config = self.tiers[complexity]
-        model_prices = pricing.get(config.model, pricing["gpt-4o-mini"])
+        model_prices = _MODEL_PRICING.get(config.model, _MODEL_PRICING["gpt-4o-mini"])
 
         input_cost = (input_tokens / 1000) * model_prices["input"]
         output_cost = (config.max_tokens / 1000) * model_prices["output"]
@@ -143,3 +170,9 @@ class ModelRouter:
                 for intent, complexity in self.intent_overrides.items()
             },
         }
+
+
+@lru_cache
+def get_model_router() -> ModelRouter:
+    """Get the shared process-wide model router."""
+    return ModelRouter()
@@ -1,11 +1,14 @@
 """Base tool class and registry for agent tools."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+import orjson
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ToolResult:
     """Result from tool execution."""
 
@@ -22,6 +25,10 @@ class ToolResult:
             result["error"] = self.error
         return result
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes for a tool message."""
+        return orjson.dumps(self.to_dict())
+
 
 class BaseTool(ABC):
     """Base class for all agent tools."""
@@ -29,6 +36,8 @@ class BaseTool(ABC):
     name: str
     description: str
     parameters: dict[str, Any]
+    uses_db_session: bool = False  # Must not run concurrently with other DB tools
+    _openai_schema: dict[str, Any]
 
     @abstractmethod
     async def execute(self, **kwargs) -> ToolResult:
@@ -42,20 +51,26 @@ class BaseTool(ABC):
         """
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        """Build the OpenAI function schema once per concrete tool class."""
+        super().__init_subclass__(**kwargs)
+        if all(hasattr(cls, attr) for attr in ("name", "description", "parameters")):
+            cls._openai_schema = {
+                "type": "function",
+                "function": {
+                    "name": cls.name,
+                    "description": cls.description,
+                    "parameters": cls.parameters,
+                },
+            }
+
     def get_openai_function_schema(self) -> dict:
         """Get OpenAI function calling schema for this tool.
 
         Returns:
             Dictionary in OpenAI function format.
         """
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters,
-            },
-        }
+        return self._openai_schema
 
 
 @dataclass
@@ -63,6 +78,10 @@ class ToolRegistry:
     """Registry for managing available tools."""
 
     _tools: dict[str, BaseTool] = field(default_factory=dict)
+    _execute_map: dict[str, Callable[..., Awaitable[ToolResult]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _schema: list[dict] | None = field(default=None, init=False, repr=False)
 
     def register(self, tool: BaseTool) -> None:
         """Register a tool in the registry.
@@ -71,6 +90,8 @@ class ToolRegistry:
             tool: Tool instance to register.
         """
         self._tools[tool.name] = tool
+        self._execute_map[tool.name] = tool.execute
+        self._schema = None
 
     def get(self, name: str) -> BaseTool | None:
         """Get a tool by name.
@@ -97,7 +118,9 @@ class ToolRegistry:
         Returns:
             List of tool schemas in OpenAI format.
         """
-        return [tool.get_openai_function_schema() for tool in self._tools.values()]
+        if self._schema is None:
+            self._schema = [tool.get_openai_function_schema() for tool in self._tools.values()]
+        return self._schema
 
     async def execute(self, name: str, **kwargs) -> ToolResult:
         """Execute a tool by name.
@@ -109,7 +132,7 @@ class ToolRegistry:
         Returns:
             ToolResult from tool execution.
         """
-        tool = self.get(name)
-        if not tool:
+        execute = self._execute_map.get(name)
+        if execute is None:
             return ToolResult(success=False, error=f"Tool '{name}' not found")
-        return await tool.execute(**kwargs)
+        return await execute(**kwargs)
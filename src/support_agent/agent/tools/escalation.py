@@ -1,11 +1,25 @@
 """Escalation tool for routing complex issues to human agents."""
 
 from datetime import datetime, timezone
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.agent.tools.base import BaseTool, ToolResult
 from support_agent.integrations.database.models import Escalation
+from support_agent.services.batch_writer import get_escalation_writer
+
+ESCALATION_MESSAGE_TEMPLATE = (
+    "Your request has been escalated to our support team. "
+    "A human agent will review your case with {priority} priority "
+    "and respond within 24 hours."
+)
+
+# Customer-facing message per priority, formatted once
+ESCALATION_MESSAGES = {
+    priority: ESCALATION_MESSAGE_TEMPLATE.format(priority=priority)
+    for priority in ("low", "medium", "high", "urgent")
+}
 
 
 class EscalateToHumanTool(BaseTool):
@@ -43,6 +57,7 @@ class EscalateToHumanTool(BaseTool):
         },
         "required": ["reason", "priority", "customer_email", "summary"],
     }
+    uses_db_session = True
 
     def __init__(self, db: AsyncSession | None = None):
         """Initialize with optional database session.
@@ -71,7 +86,9 @@ class EscalateToHumanTool(BaseTool):
             interaction_id: Optional interaction log ID.
 
         Returns:
-            ToolResult confirming escalation.
+            ToolResult confirming escalation. When the background writer
+            queues the insert, the escalation ID is returned before the row
+            is readable.
         """
         try:
             escalation_data = {
@@ -82,32 +99,44 @@ class EscalateToHumanTool(BaseTool):
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
 
-            # Persist to database if session available
+            # Persist to database if session available. When the background
+            # writer is running the insert is queued instead of flushed here,
+            # unless its queue is full.
             if self.db:
-                escalation = Escalation(
-                    interaction_id=interaction_id,
-                    reason=reason,
-                    context={
-                        "priority": priority,
-                        "customer_email": customer_email,
-                        "summary": summary,
-                    },
-                    status="pending",
-                )
-                self.db.add(escalation)
-                await self.db.flush()
-                escalation_data["id"] = str(escalation.id)
+                context = {
+                    "priority": priority,
+                    "customer_email": customer_email,
+                    "summary": summary,
+                }
+                writer = get_escalation_writer()
+                escalation_id = str(uuid4())
+                if writer.running and writer.enqueue({
+                    "id": escalation_id,
+                    "interaction_id": interaction_id,
+                    "reason": reason,
+                    "context": context,
+                    "status": "pending",
+                    "created_at": datetime.now(timezone.utc),
+                }):
+                    escalation_data["id"] = escalation_id
+                else:
+                    escalation = Escalation(
+                        interaction_id=interaction_id,
+                        reason=reason,
+                        context=context,
+                        status="pending",
+                    )
+                    self.db.add(escalation)
+                    await self.db.flush()
+                    escalation_data["id"] = str(escalation.id)
 
             return ToolResult(
                 success=True,
                 data={
                     "escalated": True,
                     "escalation": escalation_data,
-                    "message": (
-                        "Your request has been escalated to our support team. "
-                        f"A human agent will review your case with {priority} priority "
-                        "and respond within 24 hours."
-                    ),
+                    "message": ESCALATION_MESSAGES.get(priority)
+                    or ESCALATION_MESSAGE_TEMPLATE.format(priority=priority),
                 },
             )
 
@@ -3,7 +3,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.agent.tools.base import BaseTool, ToolResult
-from support_agent.services.rag import RAGService
+from support_agent.config import get_settings
+from support_agent.services.rag import RAGService, is_trivial_query
+from support_agent.services.semantic_cache import SemanticCache, get_search_result_cache
 
 
 class SearchKnowledgeBaseTool(BaseTool):
@@ -30,15 +32,22 @@ class SearchKnowledgeBaseTool(BaseTool):
         },
         "required": ["query"],
     }
+    uses_db_session = True
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, search_cache: SemanticCache[dict] | None = None):
         """Initialize with database session.
 
         Args:
             db: Async database session.
+            search_cache: Semantic cache of search results (defaults to the
+                shared cache when enabled in settings).
         """
         self.db = db
+        self.settings = get_settings()
         self.rag_service = RAGService(db)
+        if search_cache is None and self.settings.rag_cache_enabled:
+            search_cache = get_search_result_cache()
+        self.search_cache = search_cache
 
     async def execute(
         self, query: str, category: str | None = None, **kwargs
@@ -53,12 +62,8 @@ class SearchKnowledgeBaseTool(BaseTool):
             ToolResult with search results.
         """
         try:
-            results = await self.rag_service.search_with_threshold(
-                query=query,
-                category=category,
-            )
-
-            if not results:
+            # Queries like "hi" or "thanks" cannot match anything useful
+            if is_trivial_query(query):
                 return ToolResult(
                     success=True,
                     data={
@@ -67,6 +72,28 @@ class SearchKnowledgeBaseTool(BaseTool):
                     },
                 )
 
+            # Serve near-identical searches from the semantic cache
+            embedding = await self.rag_service.embed_query(query)
+            if self.search_cache:
+                match = self.search_cache.lookup(embedding, category)
+                if match and match[0] >= self.settings.rag_cache_threshold:
+                    return ToolResult(success=True, data=match[1])
+
+            results = await self.rag_service.search_with_threshold(
+                query=query,
+                category=category,
+                query_embedding=embedding,
+            )
+
+            if not results:
+                data = {
+                    "results": [],
+                    "message": "No relevant information found in knowledge base.",
+                }
+                if self.search_cache:
+                    self.search_cache.add(embedding, category, data)
+                return ToolResult(success=True, data=data)
+
             formatted_results = [
                 {
                     "title": r.title or "Untitled",
@@ -77,13 +104,13 @@ class SearchKnowledgeBaseTool(BaseTool):
                 for r in results
             ]
 
-            return ToolResult(
-                success=True,
-                data={
-                    "results": formatted_results,
-                    "count": len(formatted_results),
-                },
-            )
+            data = {
+                "results": formatted_results,
+                "count": len(formatted_results),
+            }
+            if self.search_cache:
+                self.search_cache.add(embedding, category, data)
+            return ToolResult(success=True, data=data)
 
         except Exception as e:
             return ToolResult(
@@ -1,7 +1,7 @@
 """Shopify tools for order and fulfillment lookups."""
 
 from support_agent.agent.tools.base import BaseTool, ToolResult
-from support_agent.integrations.shopify.mock import MockShopifyClient
+from support_agent.integrations.shopify.mock import MockShopifyClient, get_shopify_client
 
 
 class GetOrderTool(BaseTool):
@@ -28,9 +28,9 @@ class GetOrderTool(BaseTool):
         """Initialize with Shopify client.
 
         Args:
-            shopify_client: Shopify client instance (defaults to mock).
+            shopify_client: Shopify client instance (defaults to the shared client).
         """
-        self.client = shopify_client or MockShopifyClient()
+        self.client = shopify_client or get_shopify_client()
 
     async def execute(self, order_number: str, **kwargs) -> ToolResult:
         """Get order by order number.
@@ -92,9 +92,9 @@ class GetFulfillmentTool(BaseTool):
         """Initialize with Shopify client.
 
         Args:
-            shopify_client: Shopify client instance (defaults to mock).
+            shopify_client: Shopify client instance (defaults to the shared client).
         """
-        self.client = shopify_client or MockShopifyClient()
+        self.client = shopify_client or get_shopify_client()
 
     async def execute(self, order_number: str, **kwargs) -> ToolResult:
         """Get fulfillment info for an order.
@@ -106,8 +106,7 @@ class GetFulfillmentTool(BaseTool):
             ToolResult with fulfillment details.
         """
         try:
-            # First check if order exists
-            order = await self.client.get_order(order_number)
+            order, fulfillment = await self.client.get_order_with_fulfillment(order_number)
 
             if not order:
                 return ToolResult(
@@ -118,8 +117,6 @@ class GetFulfillmentTool(BaseTool):
                     },
                 )
 
-            fulfillment = await self.client.get_fulfillment(order_number)
-
             if not fulfillment:
                 return ToolResult(
                     success=True,
@@ -177,9 +174,9 @@ class GetCustomerOrdersTool(BaseTool):
         """Initialize with Shopify client.
 
         Args:
-            shopify_client: Shopify client instance (defaults to mock).
+            shopify_client: Shopify client instance (defaults to the shared client).
         """
-        self.client = shopify_client or MockShopifyClient()
+        self.client = shopify_client or get_shopify_client()
 
     async def execute(
         self, customer_email: str, limit: int = 5, **kwargs
@@ -210,7 +207,7 @@ class GetCustomerOrdersTool(BaseTool):
                 success=True,
                 data={
                     "found": True,
-                    "orders": [self.client.order_to_dict(o) for o in orders],
+                    "orders": self.client.orders_to_dicts(orders),
                     "count": len(orders),
                 },
             )
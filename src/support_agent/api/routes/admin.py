@@ -1,10 +1,11 @@
 """Admin endpoints for managing interactions and escalations."""
 
+import hashlib
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.integrations.database.connection import get_db
@@ -49,6 +50,40 @@ class InteractionListResponse(BaseModel):
     offset: int
 
 
+# Columns needed for InteractionSummary (skips the large body/response text)
+INTERACTION_SUMMARY_COLUMNS = (
+    InteractionLog.id,
+    InteractionLog.email_id,
+    InteractionLog.sender_email,
+    InteractionLog.subject,
+    InteractionLog.intent,
+    InteractionLog.complexity,
+    InteractionLog.model_used,
+    InteractionLog.tools_used,
+    InteractionLog.tokens_input,
+    InteractionLog.tokens_output,
+    InteractionLog.response_time_ms,
+    InteractionLog.created_at,
+)
+
+# Detail lookups are built once and executed with the id as a parameter
+INTERACTION_DETAIL_QUERY = select(InteractionLog).where(
+    InteractionLog.id == bindparam("interaction_id")
+)
+
+
+def _etag(*parts: object) -> str:
+    """Build an ETag from the values a response depends on.
+
+    Args:
+        parts: Values that change whenever the response body changes.
+
+    Returns:
+        Quoted ETag header value.
+    """
+    return f'"{hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()}"'
+
+
 # --- Escalation Models ---
 
 
@@ -89,48 +124,64 @@ class EscalationUpdateRequest(BaseModel):
     resolution_notes: str | None = None
 
 
+ESCALATION_DETAIL_QUERY = (
+    select(Escalation, *INTERACTION_SUMMARY_COLUMNS)
+    .outerjoin(InteractionLog, Escalation.interaction_id == InteractionLog.id)
+    .where(Escalation.id == bindparam("escalation_id"))
+)
+
+
 # --- Interaction Endpoints ---
 
 
 @router.get("/interactions", response_model=InteractionListResponse)
 async def list_interactions(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     sender_email: str | None = Query(default=None),
     intent: str | None = Query(default=None),
-) -> InteractionListResponse:
+) -> InteractionListResponse | Response:
     """List recent interactions with optional filtering.
 
+    Responses carry an ETag; a matching If-None-Match gets a 304.
+
     Query Parameters:
     - limit: Maximum number of results (1-100, default 20)
     - offset: Number of records to skip (default 0)
     - sender_email: Filter by sender email
     - intent: Filter by intent type
     """
-    # Build query
-    query = select(InteractionLog).order_by(InteractionLog.created_at.desc())
+    # Build query; the window count returns the filtered total with each row
+    query = select(*INTERACTION_SUMMARY_COLUMNS, func.count().over().label("total")).order_by(
+        InteractionLog.created_at.desc()
+    )
 
     if sender_email:
         query = query.where(InteractionLog.sender_email == sender_email)
     if intent:
         query = query.where(InteractionLog.intent == intent)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
     # Apply pagination
     query = query.limit(limit).offset(offset)
 
     # Execute
     result = await db.execute(query)
-    interactions = result.scalars().all()
+    rows = result.all()
+    total = rows[0].total if rows else 0
+    interactions = rows
+
+    # Interactions are never updated, so the page is identified by its ids
+    etag = _etag(total, [i.id for i in interactions])
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
     return InteractionListResponse(
         interactions=[
-            InteractionSummary(
+            InteractionSummary.model_construct(
                 id=i.id,
                 email_id=i.email_id,
                 sender_email=i.sender_email,
@@ -138,7 +189,7 @@ async def list_interactions(
                 intent=i.intent,
                 complexity=i.complexity,
                 model_used=i.model_used,
-                tools_used=i.tools_used if isinstance(i.tools_used, list) else [],
+                tools_used=i.tools_used,
                 tokens_input=i.tokens_input,
                 tokens_output=i.tokens_output,
                 response_time_ms=i.response_time_ms,
@@ -158,8 +209,7 @@ async def get_interaction(
     db: AsyncSession = Depends(get_db),
 ) -> InteractionDetail:
     """Get detailed information about a specific interaction."""
-    query = select(InteractionLog).where(InteractionLog.id == interaction_id)
-    result = await db.execute(query)
+    result = await db.execute(INTERACTION_DETAIL_QUERY, {"interaction_id": interaction_id})
     interaction = result.scalar_one_or_none()
 
     if not interaction:
@@ -174,7 +224,7 @@ async def get_interaction(
         intent=interaction.intent,
         complexity=interaction.complexity,
         model_used=interaction.model_used,
-        tools_used=interaction.tools_used if isinstance(interaction.tools_used, list) else [],
+        tools_used=interaction.tools_used,
         response=interaction.response,
         tokens_input=interaction.tokens_input,
         tokens_output=interaction.tokens_output,
@@ -188,39 +238,50 @@ async def get_interaction(
 
 @router.get("/escalations", response_model=EscalationListResponse)
 async def list_escalations(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     status: str | None = Query(default=None),
-) -> EscalationListResponse:
+) -> EscalationListResponse | Response:
     """List escalations with optional status filter.
 
+    Responses carry an ETag; a matching If-None-Match gets a 304.
+
     Query Parameters:
     - limit: Maximum number of results (1-100, default 20)
     - offset: Number of records to skip (default 0)
     - status: Filter by status (pending, assigned, resolved)
     """
-    # Build query
-    query = select(Escalation).order_by(Escalation.created_at.desc())
+    # Build query; the window count returns the filtered total with each row
+    query = select(Escalation, func.count().over().label("total")).order_by(
+        Escalation.created_at.desc()
+    )
 
     if status:
         query = query.where(Escalation.status == status)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
     # Apply pagination
     query = query.limit(limit).offset(offset)
 
     # Execute
     result = await db.execute(query)
-    escalations = result.scalars().all()
+    rows = result.all()
+    total = rows[0].total if rows else 0
+    escalations = [row[0] for row in rows]
+
+    etag = _etag(
+        total,
+        [(e.id, e.status, e.assigned_to, e.resolved_at) for e in escalations],
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
     return EscalationListResponse(
         escalations=[
-            EscalationSummary(
+            EscalationSummary.model_construct(
                 id=e.id,
                 interaction_id=e.interaction_id,
                 reason=e.reason,
@@ -243,34 +304,32 @@ async def get_escalation(
     db: AsyncSession = Depends(get_db),
 ) -> EscalationDetail:
     """Get detailed information about a specific escalation."""
-    query = select(Escalation).where(Escalation.id == escalation_id)
-    result = await db.execute(query)
-    escalation = result.scalar_one_or_none()
+    # Fetch the escalation with its interaction summary columns in one query
+    result = await db.execute(ESCALATION_DETAIL_QUERY, {"escalation_id": escalation_id})
+    row = result.one_or_none()
 
-    if not escalation:
+    if not row:
         raise HTTPException(status_code=404, detail="Escalation not found")
+    escalation = row.Escalation
+    interaction = row if row.id is not None else None
 
-    # Get associated interaction if exists
+    # Summarize associated interaction if exists
     interaction_summary = None
-    if escalation.interaction_id:
-        int_query = select(InteractionLog).where(InteractionLog.id == escalation.interaction_id)
-        int_result = await db.execute(int_query)
-        interaction = int_result.scalar_one_or_none()
-        if interaction:
-            interaction_summary = InteractionSummary(
-                id=interaction.id,
-                email_id=interaction.email_id,
-                sender_email=interaction.sender_email,
-                subject=interaction.subject,
-                intent=interaction.intent,
-                complexity=interaction.complexity,
-                model_used=interaction.model_used,
-                tools_used=interaction.tools_used if isinstance(interaction.tools_used, list) else [],
-                tokens_input=interaction.tokens_input,
-                tokens_output=interaction.tokens_output,
-                response_time_ms=interaction.response_time_ms,
-                created_at=interaction.created_at,
-            )
+    if interaction:
+        interaction_summary = InteractionSummary.model_construct(
+            id=interaction.id,
+            email_id=interaction.email_id,
+            sender_email=interaction.sender_email,
+            subject=interaction.subject,
+            intent=interaction.intent,
+            complexity=interaction.complexity,
+            model_used=interaction.model_used,
+            tools_used=interaction.tools_used,
+            tokens_input=interaction.tokens_input,
+            tokens_output=interaction.tokens_output,
+            response_time_ms=interaction.response_time_ms,
+            created_at=interaction.created_at,
+        )
 
     return EscalationDetail(
         id=escalation.id,
@@ -299,12 +358,14 @@ async def update_escalation(
     - assigned_to: Agent email/name to assign to
     - resolution_notes: Notes about the resolution
     """
-    query = select(Escalation).where(Escalation.id == escalation_id)
-    result = await db.execute(query)
-    escalation = result.scalar_one_or_none()
+    # Fetch the escalation with its interaction summary columns in one query
+    result = await db.execute(ESCALATION_DETAIL_QUERY, {"escalation_id": escalation_id})
+    row = result.one_or_none()
 
-    if not escalation:
+    if not row:
         raise HTTPException(status_code=404, detail="Escalation not found")
+    escalation = row.Escalation
+    interaction = row if row.id is not None else None
 
     # Update fields
     if update.status is not None:
@@ -323,27 +384,23 @@ async def update_escalation(
     await db.commit()
     await db.refresh(escalation)
 
-    # Get associated interaction
+    # Summarize associated interaction
     interaction_summary = None
-    if escalation.interaction_id:
-        int_query = select(InteractionLog).where(InteractionLog.id == escalation.interaction_id)
-        int_result = await db.execute(int_query)
-        interaction = int_result.scalar_one_or_none()
-        if interaction:
-            interaction_summary = InteractionSummary(
-                id=interaction.id,
-                email_id=interaction.email_id,
-                sender_email=interaction.sender_email,
-                subject=interaction.subject,
-                intent=interaction.intent,
-                complexity=interaction.complexity,
-                model_used=interaction.model_used,
-                tools_used=interaction.tools_used if isinstance(interaction.tools_used, list) else [],
-                tokens_input=interaction.tokens_input,
-                tokens_output=interaction.tokens_output,
-                response_time_ms=interaction.response_time_ms,
-                created_at=interaction.created_at,
-            )
+    if interaction:
+        interaction_summary = InteractionSummary.model_construct(
+            id=interaction.id,
+            email_id=interaction.email_id,
+            sender_email=interaction.sender_email,
+            subject=interaction.subject,
+            intent=interaction.intent,
+            complexity=interaction.complexity,
+            model_used=interaction.model_used,
+            tools_used=interaction.tools_used,
+            tokens_input=interaction.tokens_input,
+            tokens_output=interaction.tokens_output,
+            response_time_ms=interaction.response_time_ms,
+            created_at=interaction.created_at,
+        )
 
     return EscalationDetail(
         id=escalation.id,
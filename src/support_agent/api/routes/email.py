@@ -1,11 +1,16 @@
 """Email processing endpoints."""
 
+from collections.abc import AsyncIterator
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, computed_field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from support_agent.integrations.database.connection import get_db
-from support_agent.services.email_processor import EmailProcessorService
+from support_agent.config import get_settings
+from support_agent.integrations.database.connection import get_db, get_db_session
+from support_agent.services.email_processor import EmailProcessorService, process_emails
 
 router = APIRouter(prefix="/email", tags=["email"])
 
@@ -27,12 +32,19 @@ class TokenUsage(BaseModel):
 
     input: int
     output: int
-    total: int
+
+    @computed_field
+    @property
+    def total(self) -> int:
+        """Combined input and output tokens."""
+        return self.input + self.output
 
 
 class EmailProcessResponse(BaseModel):
     """Response model for email processing."""
 
+    model_config = {"from_attributes": True}
+
     success: bool
     response_text: str
     intent: str
@@ -43,7 +55,13 @@ class EmailProcessResponse(BaseModel):
     response_time_ms: int
     escalated: bool
     escalation_reason: str | None
-    interaction_id: str
+    interaction_id: str = Field(
+        description=(
+            "Interaction log ID. Logs are written in background batches, so "
+            "the interaction may take up to interaction_log_batch_max_wait "
+            "seconds to appear under /admin/interactions"
+        )
+    )
     error: str | None = None
 
 
@@ -80,20 +98,63 @@ async def process_email(
             detail=result.error or "Email processing failed",
         )
 
-    return EmailProcessResponse(
-        success=result.success,
-        response_text=result.response_text,
-        intent=result.intent,
-        complexity=result.complexity,
-        tools_used=result.tools_used,
-        model_used=result.model_used,
-        tokens=TokenUsage(
-            input=result.tokens_input,
-            output=result.tokens_output,
-            total=result.tokens_input + result.tokens_output,
-        ),
-        response_time_ms=result.response_time_ms,
-        escalated=result.escalated,
-        escalation_reason=result.escalation_reason,
-        interaction_id=result.interaction_id,
-    )
+    return EmailProcessResponse.model_validate(result)
+
+
+@router.post("/process/batch", response_model=list[EmailProcessResponse])
+async def process_email_batch(requests: list[EmailProcessRequest]) -> list[EmailProcessResponse]:
+    """Process several customer support emails concurrently.
+
+    Results are returned in request order. Emails that fail are reported
+    with success set to false rather than failing the whole batch. Batches
+    larger than settings.email_batch_max_size are rejected with 413.
+    """
+    max_size = get_settings().email_batch_max_size
+    if len(requests) > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(requests)} emails exceeds the limit of {max_size}",
+        )
+
+    results = await process_emails([
+        {
+            "from_email": request.from_email,
+            "subject": request.subject,
+            "body": request.body,
+            "sender_name": request.sender_name,
+            "email_id": request.email_id,
+        }
+        for request in requests
+    ])
+    return [EmailProcessResponse.model_validate(result) for result in results]
+
+
+@router.post("/process/stream")
+async def process_email_stream(request: EmailProcessRequest) -> StreamingResponse:
+    """Process a customer support email, streaming the response.
+
+    Returns newline-delimited JSON: a {"delta": ...} line for each piece of
+    response text as the model generates it, then a single {"result": ...}
+    line with the same fields as /email/process. Processing errors are
+    reported in the result line since the status code has already been sent.
+    """
+
+    async def events() -> AsyncIterator[bytes]:
+        # The session must outlive the handler, so it is opened here rather
+        # than injected
+        async with get_db_session() as db:
+            processor = EmailProcessorService(db)
+            async for item in processor.process_stream(
+                from_email=request.from_email,
+                subject=request.subject,
+                body=request.body,
+                sender_name=request.sender_name,
+                email_id=request.email_id,
+            ):
+                if isinstance(item, str):
+                    yield orjson.dumps({"delta": item}) + b"\n"
+                else:
+                    result = EmailProcessResponse.model_validate(item).model_dump()
+                    yield orjson.dumps({"result": result}) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,23 +1,64 @@
 """Database connection and session management."""
 
+import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from uuid import uuid4
 
+import orjson
+from pgvector.asyncpg import register_vector
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
-from support_agent.config import get_settings
+from support_agent.config import PoolStrategy, get_settings
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+if settings.db_pool_strategy == PoolStrategy.NULL:
+    # Serverless / many workers: one short-lived connection per session,
+    # pooled by PgBouncer in transaction mode. Server-side prepared
+    # statements cannot be reused across pooled backends, so caching is off
+    # and each statement gets a unique name.
+    pool_args = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    pool_args = {
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "connect_args": {
+            # Reuse server-side prepared statements for repeated queries
+            "prepared_statement_cache_size": 500,
+            "statement_cache_size": 500,
+            # HNSW scans return at most ef_search rows, so it must cover the
+            # rerank candidates
+            "server_settings": {"hnsw.ef_search": str(settings.rag_hnsw_ef_search)},
+        },
+    }
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    # Room for every distinct statement shape, including the admin filters
+    query_cache_size=1200,
+    # JSONB columns (metadata, tools_used) are encoded and decoded with orjson
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    **pool_args,
 )
 
+
 # Create session factory
 async_session_factory = async_sessionmaker(
     engine,
@@ -37,6 +78,30 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def register_vector_codec(session: AsyncSession) -> None:
+    """Bind pgvector types in binary on the session's connection.
+
+    Only needed before statements that bind or read embeddings, so other
+    connections skip the extra type-introspection round trips. Pooled
+    connections register (or fail to) once.
+
+    Args:
+        session: Session whose connection will run the statements.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    if "vector_codec" in raw_connection.info:
+        return
+    try:
+        await register_vector(raw_connection.driver_connection)
+    except ValueError as e:
+        # Unknown type: the vector extension is not installed in this database
+        logger.warning("pgvector codec not registered: %s", e)
+        raw_connection.info["vector_codec"] = False
+        return
+    raw_connection.info["vector_codec"] = True
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session as async generator (for FastAPI dependency injection)."""
     async with async_session_factory() as session:
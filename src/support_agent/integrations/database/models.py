@@ -1,11 +1,22 @@
 """SQLAlchemy ORM models with pgvector support."""
 
+import hashlib
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    cast,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -30,7 +41,7 @@ class KnowledgeBase(Base):
     category: Mapped[str] = mapped_column(String(50), nullable=False)
     title: Mapped[str | None] = mapped_column(String(255))
     extra_data: Mapped[dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
-    embedding = mapped_column(Vector(1536))
+    embedding = mapped_column(Vector(1536), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
     )
@@ -39,7 +50,22 @@ class KnowledgeBase(Base):
     )
 
     __table_args__ = (
+        # HNSW over half-precision unit-length embeddings (inner product);
+        # searches rerank on full precision
+        Index(
+            "knowledge_base_embedding_half_ip_idx",
+            cast(embedding, HALFVEC(1536)).label("embedding_half"),
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding_half": "halfvec_ip_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+        ),
         Index("knowledge_base_category_idx", "category"),
+        Index(
+            "knowledge_base_title_category_idx",
+            "title",
+            "category",
+            postgresql_include=["id"],
+        ),
     )
 
     def __repr__(self) -> str:
@@ -61,7 +87,9 @@ class InteractionLog(Base):
     intent: Mapped[str | None] = mapped_column(String(50))
     complexity: Mapped[str | None] = mapped_column(String(20))
     model_used: Mapped[str | None] = mapped_column(String(50))
-    tools_used: Mapped[dict[str, Any]] = mapped_column(JSONB, default=list)
+    tools_used: Mapped[list[str]] = mapped_column(
+        JSONB, nullable=False, default=list, server_default=text("'[]'::jsonb")
+    )
     response: Mapped[str | None] = mapped_column(Text)
     tokens_input: Mapped[int | None] = mapped_column(Integer)
     tokens_output: Mapped[int | None] = mapped_column(Integer)
@@ -74,7 +102,9 @@ class InteractionLog(Base):
     escalations: Mapped[list["Escalation"]] = relationship(back_populates="interaction")
 
     __table_args__ = (
-        Index("interaction_logs_sender_idx", "sender_email"),
+        # Composite indexes serve the admin filters ordered by created_at
+        Index("interaction_logs_sender_created_idx", "sender_email", "created_at"),
+        Index("interaction_logs_intent_created_idx", "intent", "created_at"),
         Index("interaction_logs_created_idx", "created_at"),
     )
 
@@ -106,7 +136,7 @@ class Escalation(Base):
     # Relationship to interaction
     interaction: Mapped[InteractionLog | None] = relationship(back_populates="escalations")
 
-    __table_args__ = (Index("escalations_status_idx", "status"),)
+    __table_args__ = (Index("escalations_status_created_idx", "status", "created_at"),)
 
     def __repr__(self) -> str:
         return f"<Escalation(id={self.id}, status={self.status}, reason={self.reason[:50]})>"
@@ -120,7 +150,8 @@ class ResponseCache(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
     )
-    query_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # 16-byte BLAKE2b digest of the query; the unique constraint is its index
+    query_hash: Mapped[bytes] = mapped_column(LargeBinary(16), unique=True, nullable=False)
     query_text: Mapped[str] = mapped_column(Text, nullable=False)
     response: Mapped[str] = mapped_column(Text, nullable=False)
     intent: Mapped[str | None] = mapped_column(String(50))
@@ -130,7 +161,17 @@ class ResponseCache(Base):
     )
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    __table_args__ = (Index("response_cache_hash_idx", "query_hash"),)
+    @staticmethod
+    def hash_query(query: str) -> bytes:
+        """Compute the cache key for a query.
+
+        Args:
+            query: Query text.
+
+        Returns:
+            16-byte digest for the query_hash column.
+        """
+        return hashlib.blake2b(query.encode(), digest_size=16).digest()
 
     def __repr__(self) -> str:
-        return f"<ResponseCache(id={self.id}, hash={self.query_hash}, hits={self.hit_count})>"
+        return f"<ResponseCache(id={self.id}, hash={self.query_hash.hex()}, hits={self.hit_count})>"
@@ -1,5 +1,5 @@
 """Email integration module."""
 
-from support_agent.integrations.email.parser import EmailParser, ParsedEmail
+from support_agent.integrations.email.parser import EmailParser, ParsedEmail, parse_email
 
-__all__ = ["EmailParser", "ParsedEmail"]
+__all__ = ["EmailParser", "ParsedEmail", "parse_email"]
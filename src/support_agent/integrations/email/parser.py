@@ -3,6 +3,55 @@
 import html
 import re
 from dataclasses import dataclass
+from functools import lru_cache
+
+from selectolax.lexbor import LexborHTMLParser
+
+# Bodies longer than this are stripped with selectolax instead of the regex
+SELECTOLAX_MIN_LENGTH = 4096
+
+# Script and style elements (with their content), comments, and any other tag.
+# Element bodies use possessive [^<]* loops rather than lazy .*?, and an
+# unclosed element runs to the end of input as it would in a browser, so
+# matching stays linear on long or malformed HTML.
+_STRIP_RE = re.compile(
+    r"<script\b[^>]*+>[^<]*+(?:<(?!/script\s*>)[^<]*+)*+(?:</script\s*>|\Z)"
+    r"|<style\b[^>]*+>[^<]*+(?:<(?!/style\s*>)[^<]*+)*+(?:</style\s*>|\Z)"
+    r"|<!--[^-]*+(?:-(?!->)[^-]*+)*+(?:-->|\Z)"
+    r"|<[^<>]++>",
+    re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_NAME_RE = re.compile(r"^(.+?)\s*<[^>]+>$")
+_ADDR_RE = re.compile(r"<([^>]+)>")
+
+# A tag-shaped "<name ...>" or "</name>", a comment or a doctype. Address
+# brackets like "<user@host>" do not match, since "@" cannot follow a tag name.
+_HTML_TAG_RE = re.compile(
+    r"<(?:/?[a-z][a-z0-9]*)(?:\s[^<>]*)?/?>|<!--|<!doctype",
+    re.IGNORECASE,
+)
+# Characters of the body inspected when sniffing for HTML
+_HTML_SNIFF_LENGTH = 4096
+# Longest HTML body whose cleaned text is cached; with the cache size this
+# bounds the memory held by the cache to a few tens of MB
+_CACHED_BODY_MAX_LENGTH = 64 * 1024
+
+
+def _looks_like_html(text: str) -> bool:
+    """Check whether text appears to be HTML rather than plain text.
+
+    Plain emails often contain "<" and ">" (e.g. "Name <a@b.com>"), so this
+    looks for a tag-shaped token near the start instead.
+
+    Args:
+        text: Email body.
+
+    Returns:
+        True if an HTML tag is found.
+    """
+    return _HTML_TAG_RE.search(text, 0, _HTML_SNIFF_LENGTH) is not None
 
 
 @dataclass
@@ -16,121 +65,145 @@ class ParsedEmail:
     email_id: str | None = None
 
 
+def strip_html(html_content: str) -> str:
+    """Strip HTML tags and decode entities.
+
+    Args:
+        html_content: HTML string to clean.
+
+    Returns:
+        Plain text content.
+    """
+    # Large (newsletter-style) bodies go through the lexbor HTML parser
+    if len(html_content) > SELECTOLAX_MIN_LENGTH:
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(["script", "style"])
+        root = tree.body or tree.root
+        text = root.text(separator=" ") if root else ""
+        return _WS_RE.sub(" ", text).strip()
+
+    # Remove script/style elements, comments and tags in one pass
+    text = _STRIP_RE.sub(" ", html_content)
+
+    # Decode HTML entities and normalize whitespace
+    return _WS_RE.sub(" ", html.unescape(text)).strip()
+
+
+@lru_cache(maxsize=256)
+def _strip_html_cached(html_content: str) -> str:
+    """Strip HTML, reusing results for repeated bodies.
+
+    Automated mail (out-of-office replies, bounces, re-sent tickets) often
+    repeats the same HTML body verbatim. Only call this for bodies up to
+    _CACHED_BODY_MAX_LENGTH, since the body is kept as the cache key.
+    """
+    return strip_html(html_content)
+
+
+def validate_email(email: str) -> bool:
+    """Validate email format.
+
+    Args:
+        email: Email address to validate.
+
+    Returns:
+        True if valid, False otherwise.
+    """
+    return bool(_EMAIL_RE.match(email))
+
+
+def extract_name_from_email(email: str) -> str | None:
+    """Extract a display name from email format like 'Name <email@example.com>'.
+
+    Args:
+        email: Email string possibly containing display name.
+
+    Returns:
+        Extracted name or None.
+    """
+    match = _NAME_RE.match(email.strip())
+    if match:
+        return match.group(1).strip().strip('"').strip("'")
+    return None
+
+
+def extract_email_address(email_string: str) -> str:
+    """Extract email address from format like 'Name <email@example.com>'.
+
+    Args:
+        email_string: Email string possibly containing display name.
+
+    Returns:
+        Email address only.
+    """
+    match = _ADDR_RE.search(email_string)
+    if match:
+        return match.group(1)
+    return email_string.strip()
+
+
+def parse_email(
+    from_email: str,
+    subject: str,
+    body: str,
+    sender_name: str | None = None,
+    email_id: str | None = None,
+) -> ParsedEmail:
+    """Parse email input into structured format.
+
+    Args:
+        from_email: Sender email (may include display name).
+        subject: Email subject.
+        body: Email body (may be HTML).
+        sender_name: Optional explicit sender name.
+        email_id: Optional email tracking ID.
+
+    Returns:
+        ParsedEmail with cleaned data.
+
+    Raises:
+        ValueError: If email validation fails.
+    """
+    # Extract email address and optionally name
+    email_address = extract_email_address(from_email)
+    extracted_name = extract_name_from_email(from_email)
+
+    # Validate email
+    if not validate_email(email_address):
+        raise ValueError(f"Invalid email address: {email_address}")
+
+    # Clean body (strip HTML if present)
+    if not _looks_like_html(body):
+        clean_body = body.strip()
+    elif len(body) <= _CACHED_BODY_MAX_LENGTH:
+        clean_body = _strip_html_cached(body)
+    else:
+        clean_body = strip_html(body)
+
+    # Clean subject
+    clean_subject = strip_html(subject) if "<" in subject else subject.strip()
+
+    # Use explicit name if provided, otherwise extracted name
+    final_name = sender_name or extracted_name
+
+    return ParsedEmail(
+        subject=clean_subject,
+        body=clean_body,
+        sender_email=email_address,
+        sender_name=final_name,
+        email_id=email_id,
+    )
+
+
 class EmailParser:
-    """Parser for extracting email components."""
-
-    @staticmethod
-    def strip_html(html_content: str) -> str:
-        """Strip HTML tags and decode entities.
-
-        Args:
-            html_content: HTML string to clean.
-
-        Returns:
-            Plain text content.
-        """
-        # Remove script and style elements
-        text = re.sub(r"<script[^>]*>.*?</script>", "", html_content, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r"<style[^>]*>.*?</style>", "", text, flags=re.DOTALL | re.IGNORECASE)
-
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", text)
-
-        # Decode HTML entities
-        text = html.unescape(text)
-
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
-
-    @staticmethod
-    def validate_email(email: str) -> bool:
-        """Validate email format.
-
-        Args:
-            email: Email address to validate.
-
-        Returns:
-            True if valid, False otherwise.
-        """
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return bool(re.match(pattern, email))
-
-    @staticmethod
-    def extract_name_from_email(email: str) -> str | None:
-        """Extract a display name from email format like 'Name <email@example.com>'.
-
-        Args:
-            email: Email string possibly containing display name.
-
-        Returns:
-            Extracted name or None.
-        """
-        match = re.match(r"^(.+?)\s*<[^>]+>$", email.strip())
-        if match:
-            return match.group(1).strip().strip('"').strip("'")
-        return None
-
-    @staticmethod
-    def extract_email_address(email_string: str) -> str:
-        """Extract email address from format like 'Name <email@example.com>'.
-
-        Args:
-            email_string: Email string possibly containing display name.
-
-        Returns:
-            Email address only.
-        """
-        match = re.search(r"<([^>]+)>", email_string)
-        if match:
-            return match.group(1)
-        return email_string.strip()
-
-    def parse(
-        self,
-        from_email: str,
-        subject: str,
-        body: str,
-        sender_name: str | None = None,
-        email_id: str | None = None,
-    ) -> ParsedEmail:
-        """Parse email input into structured format.
-
-        Args:
-            from_email: Sender email (may include display name).
-            subject: Email subject.
-            body: Email body (may be HTML).
-            sender_name: Optional explicit sender name.
-            email_id: Optional email tracking ID.
-
-        Returns:
-            ParsedEmail with cleaned data.
-
-        Raises:
-            ValueError: If email validation fails.
-        """
-        # Extract email address and optionally name
-        email_address = self.extract_email_address(from_email)
-        extracted_name = self.extract_name_from_email(from_email)
-
-        # Validate email
-        if not self.validate_email(email_address):
-            raise ValueError(f"Invalid email address: {email_address}")
-
-        # Clean body (strip HTML if present)
-        clean_body = self.strip_html(body) if "<" in body and ">" in body else body.strip()
-
-        # Clean subject
-        clean_subject = self.strip_html(subject) if "<" in subject else subject.strip()
-
-        # Use explicit name if provided, otherwise extracted name
-        final_name = sender_name or extracted_name
-
-        return ParsedEmail(
-            subject=clean_subject,
-            body=clean_body,
-            sender_email=email_address,
-            sender_name=final_name,
-            email_id=email_id,
-        )
+    """Parser for extracting email components.
+
+    Kept for compatibility; the module-level functions are the
+    implementation.
+    """
+
+    strip_html = staticmethod(strip_html)
+    validate_email = staticmethod(validate_email)
+    extract_name_from_email = staticmethod(extract_name_from_email)
+    extract_email_address = staticmethod(extract_email_address)
+    parse = staticmethod(parse_email)
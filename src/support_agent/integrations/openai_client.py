@@ -1,10 +1,23 @@
 """OpenAI client for embeddings and chat completions."""
 
-from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletion
+import asyncio
+import base64
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import httpx
+import numpy as np
+from openai import AsyncOpenAI, AsyncStream
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from support_agent.config import get_settings
 
+# Single-text embeddings keyed by a digest of (model, text), shared by all
+# client instances. Vectors are read-only float32 arrays (~6 KB each, against
+# ~50 KB for a list of Python floats).
+_EMBEDDING_CACHE: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
 
 class OpenAIClient:
     """Client for OpenAI API interactions."""
@@ -16,38 +29,100 @@ class OpenAIClient:
             api_key: Optional API key (defaults to settings).
         """
         settings = get_settings()
-        self.client = AsyncOpenAI(api_key=api_key or settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=500, max_keepalive_connections=250),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            ),
+        )
         self.settings = settings
 
-    async def get_embedding(self, text: str) -> list[float]:
+    async def get_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for a single text.
 
         Args:
             text: Text to embed.
 
         Returns:
-            List of floats representing the embedding vector.
+            Read-only float32 embedding vector.
         """
+        cached = self.cached_embedding(text)
+        if cached is not None:
+            return cached
+
         response = await self.client.embeddings.create(
             model=self.settings.embedding_model,
             input=text,
+            encoding_format="base64",
         )
-        return response.data[0].embedding
+        embedding = np.frombuffer(base64.b64decode(response.data[0].embedding), dtype=np.float32)
+        self.cache_embedding(text, embedding)
+        return embedding
+
+    def cached_embedding(self, text: str) -> np.ndarray | None:
+        """Look up a single-text embedding in the shared cache.
+
+        Args:
+            text: Embedded text.
+
+        Returns:
+            Cached embedding, or None if not cached.
+        """
+        cache_key = self._embedding_cache_key(text)
+        cached = _EMBEDDING_CACHE.get(cache_key)
+        if cached is not None:
+            _EMBEDDING_CACHE.move_to_end(cache_key)
+        return cached
+
+    def cache_embedding(self, text: str, embedding: np.ndarray) -> None:
+        """Store a single-text embedding in the shared cache.
+
+        Args:
+            text: Embedded text.
+            embedding: Its float32 embedding vector, which must not be
+                mutated afterwards.
+        """
+        if self.settings.embedding_cache_size > 0:
+            embedding.flags.writeable = False
+            _EMBEDDING_CACHE[self._embedding_cache_key(text)] = embedding
+            if len(_EMBEDDING_CACHE) > self.settings.embedding_cache_size:
+                _EMBEDDING_CACHE.popitem(last=False)
 
-    async def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+    def _embedding_cache_key(self, text: str) -> bytes:
+        """Digest of the embedding model and text."""
+        model = self.settings.embedding_model
+        return hashlib.blake2b(f"{model}\x1f{text}".encode(), digest_size=16).digest()
+
+    async def get_embeddings(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings for multiple texts in batch.
 
+        Embeddings are requested base64-encoded and decoded straight into a
+        float32 array, so no per-element Python floats are created. Batches
+        larger than the configured batch size are split and requested
+        concurrently.
+
         Args:
             texts: List of texts to embed.
 
         Returns:
-            List of embedding vectors.
+            Float32 array of shape (len(texts), dimensions).
         """
-        response = await self.client.embeddings.create(
-            model=self.settings.embedding_model,
-            input=texts,
-        )
-        return [item.embedding for item in response.data]
+        batch_size = self.settings.embedding_batch_size
+        responses = await asyncio.gather(*(
+            self.client.embeddings.create(
+                model=self.settings.embedding_model,
+                input=texts[start:start + batch_size],
+                encoding_format="base64",
+            )
+            for start in range(0, len(texts), batch_size)
+        ))
+        return np.vstack([
+            np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+            for response in responses
+            for item in response.data
+        ])
 
     async def chat_completion(
         self,
@@ -57,6 +132,7 @@ class OpenAIClient:
         tool_choice: str | dict = "auto",
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        response_format: dict | None = None,
     ) -> ChatCompletion:
         """Generate chat completion with optional tool calling.
 
@@ -67,6 +143,7 @@ class OpenAIClient:
             tool_choice: How to select tools ('auto', 'none', 'required', or specific tool).
             temperature: Sampling temperature.
             max_tokens: Maximum tokens in response.
+            response_format: Optional response format (e.g. a JSON schema).
 
         Returns:
             ChatCompletion object from OpenAI.
@@ -85,30 +162,69 @@ class OpenAIClient:
             kwargs["tools"] = tools
             kwargs["tool_choice"] = tool_choice
 
+        if response_format:
+            kwargs["response_format"] = response_format
+
         return await self.client.chat.completions.create(**kwargs)
 
+    async def stream_chat_completion(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        tools: list[dict] | None = None,
+        tool_choice: str | dict = "auto",
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> AsyncStream[ChatCompletionChunk]:
+        """Generate a streamed chat completion with optional tool calling.
 
-# Backwards compatibility - module-level functions
-settings = get_settings()
-_default_client = None
+        The final chunk carries token usage and has no choices.
 
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            model: Model to use (defaults to simple_model from settings).
+            tools: Optional list of tool definitions for function calling.
+            tool_choice: How to select tools ('auto', 'none', 'required', or specific tool).
+            temperature: Sampling temperature.
+            max_tokens: Maximum tokens in response.
 
-def _get_default_client() -> OpenAIClient:
-    """Get or create default client."""
-    global _default_client
-    if _default_client is None:
-        _default_client = OpenAIClient()
-    return _default_client
+        Returns:
+            Async stream of ChatCompletionChunk objects from OpenAI.
+        """
+        kwargs = {
+            "model": model or self.settings.simple_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = tool_choice
+
+        return await self.client.chat.completions.create(**kwargs)
+
+
+@lru_cache
+def get_openai_client() -> OpenAIClient:
+    """Get the shared process-wide OpenAI client."""
+    return OpenAIClient()
+
+
+# Backwards compatibility - module-level functions
+settings = get_settings()
 
 
 async def get_embedding(text: str) -> list[float]:
     """Generate embedding for a single text (backwards compatible)."""
-    return await _get_default_client().get_embedding(text)
+    return (await get_openai_client().get_embedding(text)).tolist()
 
 
-async def get_embeddings(texts: list[str]) -> list[list[float]]:
+async def get_embeddings(texts: list[str]) -> np.ndarray:
     """Generate embeddings for multiple texts (backwards compatible)."""
-    return await _get_default_client().get_embeddings(texts)
+    return await get_openai_client().get_embeddings(texts)
 
 
 async def chat_completion(
@@ -118,15 +234,17 @@ async def chat_completion(
     tool_choice: str | dict = "auto",
     temperature: float = 0.7,
     max_tokens: int = 1024,
+    response_format: dict | None = None,
 ) -> dict:
     """Generate chat completion (backwards compatible - returns dict)."""
-    response = await _get_default_client().chat_completion(
+    response = await get_openai_client().chat_completion(
         messages=messages,
         model=model,
         tools=tools,
         tool_choice=tool_choice,
         temperature=temperature,
         max_tokens=max_tokens,
+        response_format=response_format,
     )
     return {
         "message": response.choices[0].message,
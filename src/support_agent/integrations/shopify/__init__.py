@@ -1,5 +1,5 @@
 """Shopify integration module."""
 
-from support_agent.integrations.shopify.mock import MockShopifyClient
+from support_agent.integrations.shopify.mock import MockShopifyClient, get_shopify_client
 
-__all__ = ["MockShopifyClient"]
+__all__ = ["MockShopifyClient", "get_shopify_client"]
@@ -1,12 +1,15 @@
 """Mock Shopify client for local development."""
 
-import json
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
+import orjson
 
-@dataclass
+
+@dataclass(frozen=True)
 class Order:
     """Order data model."""
 
@@ -23,7 +26,7 @@ class Order:
     fulfillment: dict | None
 
 
-@dataclass
+@dataclass(frozen=True)
 class Fulfillment:
     """Fulfillment data model."""
 
@@ -49,14 +52,62 @@ class MockShopifyClient:
             data_path = Path(__file__).parent.parent.parent.parent.parent / "data" / "sample_orders.json"
         self.data_path = data_path
         self._orders: list[dict] | None = None
+        # Orders are built once on load and shared; by email is newest first
+        self._by_number: dict[str, Order] = {}
+        self._by_id: dict[str, Order] = {}
+        self._by_email: dict[str, list[Order]] = {}
+        self._fulfillments: dict[str, Fulfillment] = {}
+        # Serialized forms are shared across requests and must not be mutated
+        self._order_dict_cache: dict[str, dict[str, Any]] = {}
+        self._fulfillment_dict_cache: dict[Fulfillment, dict[str, Any]] = {}
 
     def _load_orders(self) -> list[dict]:
-        """Load orders from JSON file."""
+        """Load orders from JSON file, index and pre-serialize them."""
         if self._orders is None:
-            with open(self.data_path) as f:
-                self._orders = json.load(f)
+            orders = orjson.loads(self.data_path.read_bytes())
+            for order_data in orders:
+                order = self._order_from_data(order_data)
+                number = self._normalize_order_number(order.order_number)
+                self._by_number.setdefault(number, order)
+                self._by_id.setdefault(order.id, order)
+                self._by_email.setdefault(order.customer_email.lower(), []).append(order)
+
+                self._order_dict_cache[order.id] = self._build_order_dict(order)
+                fulfillment = self._fulfillment_from_order(order)
+                if fulfillment:
+                    self._fulfillments[order.id] = fulfillment
+                    self._fulfillment_dict_cache[fulfillment] = self._build_fulfillment_dict(
+                        fulfillment
+                    )
+            for customer_orders in self._by_email.values():
+                customer_orders.sort(key=attrgetter("created_at"), reverse=True)
+            self._orders = orders
         return self._orders
 
+    @staticmethod
+    def _order_from_data(order_data: dict) -> Order:
+        """Build an Order from raw order data.
+
+        Args:
+            order_data: Order entry from sample_orders.json.
+
+        Returns:
+            Order object.
+        """
+        return Order(
+            id=order_data["id"],
+            order_number=order_data["order_number"],
+            customer_email=order_data["customer_email"],
+            customer_name=order_data["customer_name"],
+            status=order_data["status"],
+            created_at=order_data["created_at"],
+            total_price=order_data["total_price"],
+            currency=order_data["currency"],
+            line_items=order_data["line_items"],
+            shipping_address=order_data["shipping_address"],
+            fulfillment=order_data.get("fulfillment"),
+        )
+
     def _normalize_order_number(self, order_number: str) -> str:
         """Normalize order number for comparison.
 
@@ -77,26 +128,8 @@ class MockShopifyClient:
         Returns:
             Order object or None if not found.
         """
-        orders = self._load_orders()
-        normalized = self._normalize_order_number(order_number)
-
-        for order_data in orders:
-            order_num = self._normalize_order_number(order_data["order_number"])
-            if order_num == normalized:
-                return Order(
-                    id=order_data["id"],
-                    order_number=order_data["order_number"],
-                    customer_email=order_data["customer_email"],
-                    customer_name=order_data["customer_name"],
-                    status=order_data["status"],
-                    created_at=order_data["created_at"],
-                    total_price=order_data["total_price"],
-                    currency=order_data["currency"],
-                    line_items=order_data["line_items"],
-                    shipping_address=order_data["shipping_address"],
-                    fulfillment=order_data.get("fulfillment"),
-                )
-        return None
+        self._load_orders()
+        return self._by_number.get(self._normalize_order_number(order_number))
 
     async def get_order_by_id(self, order_id: str) -> Order | None:
         """Get order by internal ID.
@@ -107,24 +140,8 @@ class MockShopifyClient:
         Returns:
             Order object or None if not found.
         """
-        orders = self._load_orders()
-
-        for order_data in orders:
-            if order_data["id"] == order_id:
-                return Order(
-                    id=order_data["id"],
-                    order_number=order_data["order_number"],
-                    customer_email=order_data["customer_email"],
-                    customer_name=order_data["customer_name"],
-                    status=order_data["status"],
-                    created_at=order_data["created_at"],
-                    total_price=order_data["total_price"],
-                    currency=order_data["currency"],
-                    line_items=order_data["line_items"],
-                    shipping_address=order_data["shipping_address"],
-                    fulfillment=order_data.get("fulfillment"),
-                )
-        return None
+        self._load_orders()
+        return self._by_id.get(order_id)
 
     async def get_fulfillment(self, order_number: str) -> Fulfillment | None:
         """Get fulfillment info for an order.
@@ -136,7 +153,34 @@ class MockShopifyClient:
             Fulfillment object or None if not fulfilled.
         """
         order = await self.get_order(order_number)
-        if not order or not order.fulfillment:
+        return self._fulfillments.get(order.id) if order else None
+
+    async def get_order_with_fulfillment(
+        self, order_number: str
+    ) -> tuple[Order | None, Fulfillment | None]:
+        """Get an order and its fulfillment info with a single lookup.
+
+        Args:
+            order_number: Order number.
+
+        Returns:
+            Tuple of (order, fulfillment); either may be None.
+        """
+        order = await self.get_order(order_number)
+        if not order:
+            return None, None
+        return order, self._fulfillments.get(order.id)
+
+    def _fulfillment_from_order(self, order: Order) -> Fulfillment | None:
+        """Build fulfillment info from an order.
+
+        Args:
+            order: Order object.
+
+        Returns:
+            Fulfillment object or None if not fulfilled.
+        """
+        if not order.fulfillment:
             return None
 
         f = order.fulfillment
@@ -162,30 +206,9 @@ class MockShopifyClient:
         Returns:
             List of Order objects.
         """
-        orders = self._load_orders()
-        customer_orders = []
-
-        for order_data in orders:
-            if order_data["customer_email"].lower() == customer_email.lower():
-                customer_orders.append(
-                    Order(
-                        id=order_data["id"],
-                        order_number=order_data["order_number"],
-                        customer_email=order_data["customer_email"],
-                        customer_name=order_data["customer_name"],
-                        status=order_data["status"],
-                        created_at=order_data["created_at"],
-                        total_price=order_data["total_price"],
-                        currency=order_data["currency"],
-                        line_items=order_data["line_items"],
-                        shipping_address=order_data["shipping_address"],
-                        fulfillment=order_data.get("fulfillment"),
-                    )
-                )
-
-        # Sort by created_at descending (most recent first)
-        customer_orders.sort(key=lambda x: x.created_at, reverse=True)
-        return customer_orders[:limit]
+        self._load_orders()
+        # Indexed most recent first
+        return self._by_email.get(customer_email.lower(), [])[:limit]
 
     def order_to_dict(self, order: Order) -> dict[str, Any]:
         """Convert Order to dictionary for serialization.
@@ -194,8 +217,28 @@ class MockShopifyClient:
             order: Order object.
 
         Returns:
-            Dictionary representation.
+            Dictionary representation, shared across calls.
         """
+        cached = self._order_dict_cache.get(order.id)
+        return cached if cached is not None else self._build_order_dict(order)
+
+    def orders_to_dicts(self, orders: list[Order]) -> list[dict[str, Any]]:
+        """Convert several Orders to dictionaries for serialization.
+
+        Args:
+            orders: Order objects.
+
+        Returns:
+            Dictionary representations, shared across calls.
+        """
+        cache = self._order_dict_cache
+        return [
+            cache[o.id] if o.id in cache else self._build_order_dict(o) for o in orders
+        ]
+
+    @staticmethod
+    def _build_order_dict(order: Order) -> dict[str, Any]:
+        """Build the dictionary representation of an Order."""
         return {
             "id": order.id,
             "order_number": order.order_number,
@@ -217,8 +260,14 @@ class MockShopifyClient:
             fulfillment: Fulfillment object.
 
         Returns:
-            Dictionary representation.
+            Dictionary representation, shared across calls.
         """
+        cached = self._fulfillment_dict_cache.get(fulfillment)
+        return cached if cached is not None else self._build_fulfillment_dict(fulfillment)
+
+    @staticmethod
+    def _build_fulfillment_dict(fulfillment: Fulfillment) -> dict[str, Any]:
+        """Build the dictionary representation of a Fulfillment."""
         return {
             "status": fulfillment.status,
             "carrier": fulfillment.carrier,
@@ -228,3 +277,9 @@ class MockShopifyClient:
             "delivered_at": fulfillment.delivered_at,
             "estimated_delivery": fulfillment.estimated_delivery,
         }
+
+
+@lru_cache
+def get_shopify_client() -> MockShopifyClient:
+    """Get the shared process-wide Shopify client."""
+    return MockShopifyClient()
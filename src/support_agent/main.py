@@ -4,10 +4,17 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from support_agent.api.routes import admin_router, email_router, health_router
 from support_agent.config import get_settings
 from support_agent.integrations.database.connection import init_db
+from support_agent.services.batch_writer import (
+    get_escalation_writer,
+    get_interaction_log_writer,
+)
+from support_agent.services.embedding import get_embedding_batcher
+from support_agent.services.rag import get_knowledge_base_index, get_rag_search_batcher
 
 
 @asynccontextmanager
@@ -22,10 +29,36 @@ async def lifespan(app: FastAPI):
         await init_db()
         print("Database initialized")
 
+    # Write interaction logs and escalations in background batches
+    interaction_log_writer = get_interaction_log_writer()
+    interaction_log_writer.start()
+    escalation_writer = get_escalation_writer()
+    escalation_writer.start()
+
+    # Coalesce concurrent embedding requests
+    embedding_batcher = get_embedding_batcher()
+    embedding_batcher.start()
+
+    # Search a small knowledge base in memory; batched pgvector searches are
+    # only needed when it is too large to load
+    knowledge_base_index = get_knowledge_base_index()
+    try:
+        await knowledge_base_index.load()
+    except Exception as e:
+        print(f"Knowledge base index not loaded: {e}")
+    rag_search_batcher = get_rag_search_batcher()
+    if not knowledge_base_index.active:
+        rag_search_batcher.start()
+
     yield
 
     # Shutdown
     print("Shutting down Support Agent API...")
+    await knowledge_base_index.stop()
+    await rag_search_batcher.stop()
+    await embedding_batcher.stop()
+    await interaction_log_writer.stop()
+    await escalation_writer.stop()
 
 
 def create_app() -> FastAPI:
@@ -38,6 +71,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         lifespan=lifespan,
         debug=settings.debug,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware
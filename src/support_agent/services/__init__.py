@@ -1,6 +1,47 @@
 """Business logic services."""
 
-from .embedding import EmbeddingService
-from .rag import RAGResult, RAGService
+from .batch_writer import BatchWriter, get_escalation_writer, get_interaction_log_writer
+from .batching import BackgroundBatcher
+from .embedding import (
+    EmbeddingBatcher,
+    EmbeddingService,
+    get_embedding_batcher,
+    get_embedding_service,
+)
+from .rag import (
+    KnowledgeBaseIndex,
+    RAGResult,
+    RAGSearchBatcher,
+    RAGService,
+    get_knowledge_base_index,
+    get_rag_search_batcher,
+    is_trivial_query,
+)
+from .semantic_cache import (
+    SemanticCache,
+    SemanticResponseCache,
+    get_search_result_cache,
+    get_semantic_response_cache,
+)
 
-__all__ = ["EmbeddingService", "RAGService", "RAGResult"]
+__all__ = [
+    "BackgroundBatcher",
+    "BatchWriter",
+    "get_escalation_writer",
+    "get_interaction_log_writer",
+    "EmbeddingBatcher",
+    "EmbeddingService",
+    "get_embedding_batcher",
+    "get_embedding_service",
+    "KnowledgeBaseIndex",
+    "get_knowledge_base_index",
+    "RAGService",
+    "is_trivial_query",
+    "RAGResult",
+    "RAGSearchBatcher",
+    "get_rag_search_batcher",
+    "SemanticCache",
+    "SemanticResponseCache",
+    "get_search_result_cache",
+    "get_semantic_response_cache",
+]
@@ -0,0 +1,104 @@
+"""Background writers that batch log and escalation inserts off the request path."""
+
+import logging
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import insert
+
+from support_agent.config import get_settings
+from support_agent.integrations.database.connection import async_session_factory
+from support_agent.integrations.database.models import Base, Escalation, InteractionLog
+from support_agent.services.batching import BackgroundBatcher
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter(BackgroundBatcher[dict[str, Any]]):
+    """Queue of table rows inserted in batches by a background task.
+
+    Rows must carry a client-generated ``id`` so callers can report it
+    without waiting for the insert. The row only exists once its batch is
+    written, up to ``max_wait`` seconds (plus the insert) after it is queued.
+    """
+
+    # One insert at a time, so a burst does not take over the pool
+    concurrent = False
+
+    def __init__(
+        self,
+        model: type[Base],
+        batch_size: int = 16,
+        max_wait: float = 0.05,
+        max_queue: int = 1000,
+    ):
+        """Initialize the writer.
+
+        Args:
+            model: ORM model whose table the rows are inserted into.
+            batch_size: Maximum rows per insert.
+            max_wait: Seconds to wait for more rows before writing a batch.
+            max_queue: Maximum rows waiting to be written.
+        """
+        super().__init__(batch_size, max_wait, max_queue)
+        self.model = model
+
+    def enqueue(self, row: dict[str, Any]) -> bool:
+        """Queue a row for insertion.
+
+        Args:
+            row: Column values, including ``id``.
+
+        Returns:
+            False if the queue is full and the caller must insert the row
+            itself.
+        """
+        return self._submit(row)
+
+    async def _execute(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch, falling back to row-by-row inserts on failure.
+
+        Args:
+            batch: Rows to insert.
+        """
+        table = self.model.__tablename__
+        try:
+            async with async_session_factory() as session:
+                await session.execute(insert(self.model), batch)
+                await session.commit()
+            return
+        except Exception as e:
+            logger.warning(
+                "%s batch insert of %d rows failed, retrying individually: %s",
+                table, len(batch), e,
+            )
+
+        for row in batch:
+            try:
+                async with async_session_factory() as session:
+                    await session.execute(insert(self.model), [row])
+                    await session.commit()
+            except Exception:
+                logger.exception("Dropped %s row %s after failed insert", table, row["id"])
+
+
+@lru_cache
+def get_escalation_writer() -> BatchWriter:
+    """Get the shared process-wide escalation writer."""
+    settings = get_settings()
+    return BatchWriter(
+        Escalation,
+        batch_size=settings.escalation_batch_size,
+        max_wait=settings.escalation_batch_max_wait,
+    )
+
+
+@lru_cache
+def get_interaction_log_writer() -> BatchWriter:
+    """Get the shared process-wide interaction log writer."""
+    settings = get_settings()
+    return BatchWriter(
+        InteractionLog,
+        batch_size=settings.interaction_log_batch_size,
+        max_wait=settings.interaction_log_batch_max_wait,
+    )
@@ -0,0 +1,117 @@
+"""Background task that collects queued items into batches."""
+
+import asyncio
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundBatcher(Generic[T]):
+    """Queue drained in batches by a background task.
+
+    The first queued item opens a batch, which collects further items until
+    it holds ``batch_size`` of them or ``max_wait`` seconds have passed.
+    Subclasses implement ``_execute`` to process one batch.
+    """
+
+    # Whether a batch is processed while the next one is collected, rather
+    # than before collecting resumes
+    concurrent = True
+
+    def __init__(self, batch_size: int, max_wait: float, max_queue: int = 0):
+        """Initialize the batcher.
+
+        Args:
+            batch_size: Maximum items per batch.
+            max_wait: Seconds to wait for more items before processing.
+            max_queue: Maximum items waiting to be batched (0 is unbounded).
+        """
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue[T | None] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is accepting items."""
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def start(self) -> None:
+        """Start the background task (call from the running event loop)."""
+        if not self.running and not self._stopping:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Process any queued items and stop the background task.
+
+        Items are refused from the moment stopping begins, since nothing
+        would process those queued behind the stop sentinel.
+        """
+        if self._task is not None and not self._task.done():
+            if not self._stopping:
+                self._stopping = True
+                # Waits for room if the queue is full
+                await self._queue.put(None)
+            await self._task
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        self._task = None
+        self._stopping = False
+
+    def _submit(self, item: T) -> bool:
+        """Queue an item for the next batch.
+
+        Args:
+            item: Item to queue.
+
+        Returns:
+            False if the batcher is not running or the queue is full, in
+            which case the caller must handle the item itself.
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _run(self) -> None:
+        """Collect items into batches and process them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if self.concurrent:
+                task = asyncio.create_task(self._execute(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            else:
+                await self._execute(batch)
+
+    async def _execute(self, batch: list[T]) -> None:
+        """Process one batch.
+
+        Args:
+            batch: Queued items, in queue order.
+        """
+        raise NotImplementedError
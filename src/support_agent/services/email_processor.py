@@ -1,16 +1,22 @@
 """Email processing service."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.agent.core import AgentResponse, SupportAgent
+from support_agent.config import get_settings
+from support_agent.integrations.database.connection import get_db_session
 from support_agent.integrations.database.models import InteractionLog
-from support_agent.integrations.email.parser import EmailParser, ParsedEmail
+from support_agent.integrations.email.parser import ParsedEmail, parse_email
+from support_agent.services.batch_writer import get_interaction_log_writer
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessedEmailResponse:
     """Response from email processing."""
 
@@ -28,6 +34,14 @@ class ProcessedEmailResponse:
     interaction_id: str
     error: str | None = None
 
+    @property
+    def tokens(self) -> dict[str, int]:
+        """Token usage breakdown."""
+        return {
+            "input": self.tokens_input,
+            "output": self.tokens_output,
+        }
+
 
 class EmailProcessorService:
     """Service for processing customer support emails."""
@@ -39,7 +53,6 @@ class EmailProcessorService:
             db: Database session.
         """
         self.db = db
-        self.parser = EmailParser()
         self.agent = SupportAgent(db)
 
     async def process(
@@ -64,7 +77,7 @@ class EmailProcessorService:
         """
         try:
             # Parse email
-            parsed = self.parser.parse(
+            parsed = parse_email(
                 from_email=from_email,
                 subject=subject,
                 body=body,
@@ -86,56 +99,126 @@ class EmailProcessorService:
                 agent_response=agent_response,
             )
 
-            return ProcessedEmailResponse(
-                success=True,
-                response_text=agent_response.response_text,
-                intent=agent_response.classification.intent.value,
-                complexity=agent_response.classification.complexity.value,
-                tools_used=agent_response.tools_used,
-                model_used=agent_response.model_used,
-                tokens_input=agent_response.tokens_input,
-                tokens_output=agent_response.tokens_output,
-                response_time_ms=agent_response.response_time_ms,
-                escalated=agent_response.escalated,
-                escalation_reason=agent_response.escalation_reason,
-                interaction_id=interaction_id,
-            )
+            return self._success_response(agent_response, interaction_id)
 
         except ValueError as e:
             # Validation error (e.g., invalid email)
-            return ProcessedEmailResponse(
-                success=False,
-                response_text="",
-                intent="unknown",
-                complexity="unknown",
-                tools_used=[],
-                model_used="none",
-                tokens_input=0,
-                tokens_output=0,
-                response_time_ms=0,
-                escalated=False,
-                escalation_reason=None,
-                interaction_id="",
-                error=str(e),
-            )
+            return self._error_response(str(e))
 
         except Exception as e:
             # Unexpected error
-            return ProcessedEmailResponse(
-                success=False,
-                response_text="",
-                intent="unknown",
-                complexity="unknown",
-                tools_used=[],
-                model_used="none",
-                tokens_input=0,
-                tokens_output=0,
-                response_time_ms=0,
-                escalated=False,
-                escalation_reason=None,
-                interaction_id="",
-                error=f"Processing error: {str(e)}",
+            return self._error_response(f"Processing error: {str(e)}")
+
+    async def process_stream(
+        self,
+        from_email: str,
+        subject: str,
+        body: str,
+        sender_name: str | None = None,
+        email_id: str | None = None,
+    ) -> AsyncIterator[str | ProcessedEmailResponse]:
+        """Process a customer email, streaming the response text.
+
+        Args:
+            from_email: Sender email address.
+            subject: Email subject.
+            body: Email body.
+            sender_name: Optional sender name.
+            email_id: Optional email tracking ID.
+
+        Yields:
+            Response text deltas as the model generates them, then the
+            ProcessedEmailResponse.
+        """
+        try:
+            parsed = parse_email(
+                from_email=from_email,
+                subject=subject,
+                body=body,
+                sender_name=sender_name,
+                email_id=email_id,
+            )
+
+            agent_response = None
+            async for item in self.agent.process_email_stream(
+                subject=parsed.subject,
+                body=parsed.body,
+                sender_email=parsed.sender_email,
+                sender_name=parsed.sender_name,
+            ):
+                if isinstance(item, AgentResponse):
+                    agent_response = item
+                else:
+                    yield item
+
+            interaction_id = await self._log_interaction(
+                parsed_email=parsed,
+                agent_response=agent_response,
             )
+            result = self._success_response(agent_response, interaction_id)
+
+        except ValueError as e:
+            result = self._error_response(str(e))
+
+        except Exception as e:
+            result = self._error_response(f"Processing error: {str(e)}")
+
+        yield result
+
+    @staticmethod
+    def _success_response(
+        agent_response: AgentResponse,
+        interaction_id: str,
+    ) -> ProcessedEmailResponse:
+        """Build the response for a successfully processed email.
+
+        Args:
+            agent_response: Agent response data.
+            interaction_id: Logged interaction ID.
+
+        Returns:
+            Successful ProcessedEmailResponse.
+        """
+        return ProcessedEmailResponse(
+            success=True,
+            response_text=agent_response.response_text,
+            intent=agent_response.classification.intent.value,
+            complexity=agent_response.classification.complexity.value,
+            tools_used=agent_response.tools_used,
+            model_used=agent_response.model_used,
+            tokens_input=agent_response.tokens_input,
+            tokens_output=agent_response.tokens_output,
+            response_time_ms=agent_response.response_time_ms,
+            escalated=agent_response.escalated,
+            escalation_reason=agent_response.escalation_reason,
+            interaction_id=interaction_id,
+        )
+
+    @staticmethod
+    def _error_response(error: str) -> ProcessedEmailResponse:
+        """Build the response for an email that could not be processed.
+
+        Args:
+            error: Error message.
+
+        Returns:
+            Failed ProcessedEmailResponse.
+        """
+        return ProcessedEmailResponse(
+            success=False,
+            response_text="",
+            intent="unknown",
+            complexity="unknown",
+            tools_used=[],
+            model_used="none",
+            tokens_input=0,
+            tokens_output=0,
+            response_time_ms=0,
+            escalated=False,
+            escalation_reason=None,
+            interaction_id="",
+            error=error,
+        )
 
     async def _log_interaction(
         self,
@@ -144,6 +227,11 @@ class EmailProcessorService:
     ) -> str:
         """Log interaction to database.
 
+        When the background writer is running the insert is queued instead of
+        committed here, so the returned ID may not be readable until the
+        writer's next batch lands. A full queue falls back to the inline
+        insert.
+
         Args:
             parsed_email: Parsed email data.
             agent_response: Agent response data.
@@ -151,6 +239,26 @@ class EmailProcessorService:
         Returns:
             Interaction ID.
         """
+        writer = get_interaction_log_writer()
+        interaction_id = str(uuid4())
+        if writer.running and writer.enqueue({
+            "id": interaction_id,
+            "email_id": parsed_email.email_id,
+            "sender_email": parsed_email.sender_email,
+            "subject": parsed_email.subject,
+            "body": parsed_email.body,
+            "intent": agent_response.classification.intent.value,
+            "complexity": agent_response.classification.complexity.value,
+            "model_used": agent_response.model_used,
+            "tools_used": agent_response.tools_used,
+            "response": agent_response.response_text,
+            "tokens_input": agent_response.tokens_input,
+            "tokens_output": agent_response.tokens_output,
+            "response_time_ms": agent_response.response_time_ms,
+            "created_at": datetime.now(timezone.utc),
+        }):
+            return interaction_id
+
         interaction = InteractionLog(
             email_id=parsed_email.email_id,
             sender_email=parsed_email.sender_email,
@@ -171,3 +279,31 @@ class EmailProcessorService:
         await self.db.refresh(interaction)
 
         return interaction.id
+
+
+async def process_emails(
+    emails: list[dict],
+    concurrency: int | None = None,
+) -> list[ProcessedEmailResponse]:
+    """Process several customer emails concurrently.
+
+    Each email gets its own database session, since a session cannot be
+    shared between concurrent tasks. Embedding and search calls made at the
+    same time are coalesced by the shared batchers when they are running.
+
+    Args:
+        emails: Keyword arguments for EmailProcessorService.process, one
+            dict per email.
+        concurrency: Maximum emails in flight (defaults to
+            settings.email_batch_concurrency).
+
+    Returns:
+        ProcessedEmailResponse per email, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency or get_settings().email_batch_concurrency)
+
+    async def process_one(email: dict) -> ProcessedEmailResponse:
+        async with semaphore, get_db_session() as db:
+            return await EmailProcessorService(db).process(**email)
+
+    return await asyncio.gather(*(process_one(email) for email in emails))
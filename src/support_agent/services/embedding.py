@@ -1,38 +1,123 @@
 """Embedding service for generating and managing text embeddings."""
 
-from support_agent.integrations.openai_client import get_embedding, get_embeddings
+import asyncio
+from functools import lru_cache
+
+import numpy as np
+
+from support_agent.config import get_settings
+from support_agent.integrations.openai_client import get_embeddings, get_openai_client
+from support_agent.services.batching import BackgroundBatcher
+
+
+class EmbeddingBatcher(BackgroundBatcher[tuple[str, asyncio.Future]]):
+    """Coalesces concurrent single-text embeddings into batch requests.
+
+    Texts queued within ``max_wait`` of each other are embedded with one
+    embeddings request. Cached texts are answered without queueing, and
+    results are added to the shared single-text cache.
+    """
+
+    def __init__(self, batch_size: int = 96, max_wait: float = 0.01):
+        """Initialize the batcher.
+
+        Args:
+            batch_size: Maximum texts per request.
+            max_wait: Seconds to wait for more texts before requesting.
+        """
+        super().__init__(batch_size, max_wait)
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Queue a text and wait for its batch to be embedded.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Read-only float32 embedding vector.
+        """
+        cached = get_openai_client().cached_embedding(text)
+        if cached is not None:
+            return cached
+
+        future = asyncio.get_running_loop().create_future()
+        if not self._submit((text, future)):
+            return await get_openai_client().get_embedding(text)
+        return await future
+
+    async def _execute(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Embed a batch of texts and resolve their futures.
+
+        Args:
+            batch: Queued (text, future) pairs.
+        """
+        # Identical texts queued together are embedded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = await get_embeddings(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        client = get_openai_client()
+        by_text = {}
+        for text, embedding in zip(texts, embeddings):
+            # Copy the row so a cached vector does not pin the whole batch
+            by_text[text] = embedding.copy()
+            client.cache_embedding(text, by_text[text])
+        for text, future in batch:
+            # The caller may have been cancelled while waiting
+            if not future.done():
+                future.set_result(by_text[text])
+
+
+@lru_cache
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get the shared process-wide embedding batcher."""
+    settings = get_settings()
+    return EmbeddingBatcher(
+        batch_size=settings.embedding_batch_size,
+        max_wait=settings.embedding_batch_max_wait,
+    )
 
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI."""
 
-    async def embed_text(self, text: str) -> list[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text.
 
+        Goes through the shared batcher when it is running.
+
         Args:
             text: Text to embed.
 
         Returns:
-            Embedding vector as list of floats.
+            Read-only float32 embedding vector.
         """
-        return await get_embedding(text)
+        batcher = get_embedding_batcher()
+        if batcher.running:
+            return await batcher.embed(text)
+        return await get_openai_client().get_embedding(text)
 
-    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    async def embed_texts(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings for multiple texts.
 
         Args:
             texts: List of texts to embed.
 
         Returns:
-            List of embedding vectors.
+            Float32 array with one embedding vector per row.
         """
         return await get_embeddings(texts)
 
-    async def embed_for_search(self, query: str) -> list[float]:
+    async def embed_for_search(self, query: str) -> np.ndarray:
         """Generate embedding optimized for search query.
 
-        Currently uses same embedding as regular text,
-        but can be customized for query-specific preprocessing.
+        Whitespace is collapsed first so queries differing only in spacing
+        or line breaks share an embedding cache entry.
 
         Args:
             query: Search query text.
@@ -41,4 +126,10 @@ class EmbeddingService:
             Query embedding vector.
         """
         # Optionally preprocess query (e.g., add "query: " prefix for some models)
-        return await get_embedding(query)
+        return await self.embed_text(" ".join(query.split()))
+
+
+@lru_cache
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared process-wide embedding service."""
+    return EmbeddingService()
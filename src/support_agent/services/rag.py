@@ -1,18 +1,88 @@
 """RAG (Retrieval Augmented Generation) service for knowledge base search."""
 
-from dataclasses import dataclass
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, replace
+from functools import lru_cache
 
-from sqlalchemy import select, text
+import numpy as np
+from sqlalchemy import TextClause, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from support_agent.config import get_settings
+from support_agent.integrations.database.connection import (
+    async_session_factory,
+    register_vector_codec,
+)
 from support_agent.integrations.database.models import KnowledgeBase
-from support_agent.services.embedding import EmbeddingService
+from support_agent.services.batching import BackgroundBatcher
+from support_agent.services.embedding import EmbeddingService, get_embedding_service
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Candidates fetched per requested result by the half-precision index scan,
+# before reranking on the full-precision embedding
+RERANK_CANDIDATE_FACTOR = 4
+
+# Words that say nothing about what to look up on their own
+_STOPWORDS = frozenset({
+    "a", "an", "and", "any", "are", "can", "do", "does", "for", "hello", "hey",
+    "hi", "how", "i", "in", "is", "it", "me", "my", "no", "of", "ok", "okay",
+    "on", "or", "please", "thank", "thanks", "the", "to", "what", "when",
+    "where", "why", "with", "yes", "you", "your",
+})
+_WORD_PUNCTUATION = ".,;:!?'\"()"
+
+# Search statements are built once so each call skips text() parsing and
+# reuses the engine's compiled-statement cache. The embedding is bound in
+# binary by the pgvector codec (see register_vector_codec); the casts only
+# pin the parameter's type.
+# Stored and query embeddings are unit length, so the negative inner product
+# (<#>) ranks and scores exactly like cosine similarity without the norms.
+_SEARCH_SQL = text("""
+    SELECT
+        id,
+        content,
+        category,
+        title,
+        metadata,
+        -(embedding <#> CAST(:embedding AS vector)) as score
+    FROM (
+        SELECT id, content, category, title, metadata, embedding
+        FROM knowledge_base
+        ORDER BY embedding::halfvec(1536) <#> CAST(:embedding AS vector)::halfvec(1536)
+        LIMIT :candidates
+    ) AS candidate
+    ORDER BY score DESC
+    LIMIT :limit
+""")
+
+_SEARCH_BY_CATEGORY_SQL = text("""
+    SELECT
+        id,
+        content,
+        category,
+        title,
+        metadata,
+        -(embedding <#> CAST(:embedding AS vector)) as score
+    FROM (
+        SELECT id, content, category, title, metadata, embedding
+        FROM knowledge_base
+        WHERE category = :category
+        ORDER BY embedding::halfvec(1536) <#> CAST(:embedding AS vector)::halfvec(1536)
+        LIMIT :candidates
+    ) AS candidate
+    ORDER BY score DESC
+    LIMIT :limit
+""")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class RAGResult:
     """Result from RAG knowledge base search."""
 
@@ -23,93 +93,452 @@ class RAGResult:
     score: float
     metadata: dict
 
+    @classmethod
+    def from_row(cls, row) -> "RAGResult":
+        """Build a result from a search statement row."""
+        return cls(
+            id=str(row.id),
+            content=row.content,
+            category=row.category,
+            title=row.title,
+            score=float(row.score),
+            metadata=row.metadata or {},
+        )
+
+
+_KNOWLEDGE_BASE_COUNT_SQL = text("SELECT count(*) FROM knowledge_base")
+
+_KNOWLEDGE_BASE_ROWS_SQL = text("""
+    SELECT id, content, category, title, metadata, embedding
+    FROM knowledge_base
+""")
+
+
+@lru_cache(maxsize=64)
+def _batch_search_sql(size: int) -> TextClause:
+    """Build the statement running ``size`` searches in one round trip.
+
+    Each search is a row of query parameters driving a LATERAL copy of the
+    single search statement.
+    """
+    queries = ", ".join(
+        f"({i}, CAST(:embedding_{i} AS vector), CAST(:category_{i} AS text), "
+        f"CAST(:limit_{i} AS integer))"
+        for i in range(size)
+    )
+    return text(f"""
+        SELECT query.i AS query_index, result.*
+        FROM (VALUES {queries}) AS query(i, embedding, category, lim)
+        CROSS JOIN LATERAL (
+            SELECT
+                id,
+                content,
+                category,
+                title,
+                metadata,
+                -(candidate.embedding <#> query.embedding) as score
+            FROM (
+                SELECT id, content, category, title, metadata, embedding
+                FROM knowledge_base
+                WHERE query.category IS NULL OR knowledge_base.category = query.category
+                ORDER BY embedding::halfvec(1536) <#> query.embedding::halfvec(1536)
+                LIMIT query.lim * {RERANK_CANDIDATE_FACTOR}
+            ) AS candidate
+            ORDER BY score DESC
+            LIMIT query.lim
+        ) AS result
+        ORDER BY query.i, result.score DESC
+    """)
+
+
+class RAGSearchBatcher(BackgroundBatcher[tuple]):
+    """Coalesces concurrent knowledge base searches into single queries.
+
+    Searches queued within ``max_wait`` of each other run as one statement on
+    the batcher's own session, saving a round trip and a pooled connection
+    per search under load.
+    """
+
+    def __init__(self, batch_size: int = 32, max_wait: float = 0.005):
+        """Initialize the batcher.
+
+        Args:
+            batch_size: Maximum searches per query.
+            max_wait: Seconds to wait for more searches before querying.
+        """
+        super().__init__(batch_size, max_wait)
+
+    async def search(
+        self, embedding: np.ndarray, category: str | None, limit: int
+    ) -> list[RAGResult] | None:
+        """Queue a search and wait for its batch to run.
+
+        Args:
+            embedding: Float32 query embedding.
+            category: Optional category filter.
+            limit: Maximum number of results.
+
+        Returns:
+            List of RAGResult objects sorted by similarity score, or None if
+            the batcher is not running and the caller must search itself.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self._submit((embedding, category or None, limit, future)):
+            return None
+        return await future
+
+    async def _execute(self, batch: list[tuple]) -> None:
+        """Run a batch of searches and resolve their futures.
+
+        Args:
+            batch: Queued (embedding, category, limit, future) tuples.
+        """
+        params = {}
+        for i, (embedding, category, limit, _) in enumerate(batch):
+            params[f"embedding_{i}"] = embedding
+            params[f"category_{i}"] = category
+            params[f"limit_{i}"] = limit
+
+        try:
+            async with async_session_factory() as session:
+                await register_vector_codec(session)
+                result = await session.execute(_batch_search_sql(len(batch)), params)
+                rows = result.fetchall()
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results: list[list[RAGResult]] = [[] for _ in batch]
+        for row in rows:
+            results[row.query_index].append(RAGResult.from_row(row))
+        for (*_, future), found in zip(batch, results):
+            # The caller may have been cancelled while waiting
+            if not future.done():
+                future.set_result(found)
+
+
+@lru_cache
+def get_rag_search_batcher() -> RAGSearchBatcher:
+    """Get the shared process-wide search batcher."""
+    return RAGSearchBatcher(
+        batch_size=settings.rag_batch_size,
+        max_wait=settings.rag_batch_max_wait,
+    )
+
+
+class KnowledgeBaseIndex:
+    """In-process copy of a small knowledge base for brute-force search.
+
+    Embeddings are held L2-normalized in a float32 matrix, so a search is one
+    matrix-vector product with no database round trip. Once the copy is
+    ``max_age`` seconds old it is reloaded by a background task while the
+    stale copy keeps serving; only the first load blocks searches. Knowledge
+    bases larger than ``max_rows`` are not loaded and searches fall back to
+    pgvector.
+
+    Queries that repeat an entry's content or title can also reuse that
+    entry's stored embedding instead of being embedded.
+    """
+
+    def __init__(self, max_rows: int = 10_000, max_age: float = 300):
+        """Initialize the index.
+
+        Args:
+            max_rows: Largest knowledge base to hold in memory (0 disables).
+            max_age: Seconds before the copy is reloaded.
+        """
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._embeddings: np.ndarray | None = None
+        self._categories: np.ndarray | None = None
+        self._entries: list[RAGResult] = []
+        self._by_text: dict[str, int] = {}
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._reload_task: asyncio.Task | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether searches are answered from the in-memory copy."""
+        return self._embeddings is not None
+
+    async def load(self) -> None:
+        """Load the copy now, e.g. at startup rather than on the first search."""
+        if self.max_rows <= 0:
+            return
+        async with self._lock:
+            await self._reload()
+
+    async def stop(self) -> None:
+        """Cancel any background reload."""
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reload_task
+            self._reload_task = None
+
+    async def embedding_for(self, text: str) -> np.ndarray | None:
+        """Find the stored embedding of an entry matching a text.
+
+        Args:
+            text: Query text, compared with entry content and titles
+                ignoring case and whitespace.
+
+        Returns:
+            Normalized float32 embedding of the matching entry, or None.
+        """
+        if self.max_rows <= 0:
+            return None
+        await self._refresh()
+        index = self._by_text.get(_text_key(text))
+        return None if index is None else self._embeddings[index]
+
+    async def search(
+        self, embedding: np.ndarray, category: str | None, limit: int
+    ) -> list[RAGResult] | None:
+        """Search the in-memory copy.
+
+        Args:
+            embedding: Float32 query embedding.
+            category: Optional category filter.
+            limit: Maximum number of results.
+
+        Returns:
+            List of RAGResult objects sorted by similarity score, or None if
+            the knowledge base is too large to search in process.
+        """
+        if self.max_rows <= 0:
+            return None
+        await self._refresh()
+        if self._embeddings is None:
+            return None
+
+        norm = np.linalg.norm(embedding)
+        scores = self._embeddings @ (embedding / norm if norm else embedding)
+        if category:
+            scores[self._categories != category] = -np.inf
+        count = min(limit, len(scores))
+        if count == 0:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return [
+            replace(self._entries[index], score=float(scores[index]))
+            for index in top
+            if scores[index] > -np.inf
+        ]
+
+    async def _refresh(self) -> None:
+        """Load the copy if missing, or start a background reload if stale."""
+        if self._loaded_at == float("-inf"):
+            async with self._lock:
+                # Another search may have loaded while this one waited
+                if self._loaded_at == float("-inf"):
+                    await self._reload()
+            return
+
+        stale = time.monotonic() - self._loaded_at >= self.max_age
+        if stale and (self._reload_task is None or self._reload_task.done()):
+            self._reload_task = asyncio.create_task(self._reload_in_background())
+
+    async def _reload_in_background(self) -> None:
+        """Reload the copy, keeping the stale one if the reload fails."""
+        async with self._lock:
+            try:
+                await self._reload()
+            except Exception:
+                logger.warning("Knowledge base index reload failed", exc_info=True)
+                # Retry after another max_age rather than on every search
+                self._loaded_at = time.monotonic()
+
+    async def _reload(self) -> None:
+        """Read the knowledge base and swap in the new copy."""
+        async with async_session_factory() as session:
+            await register_vector_codec(session)
+            count = await session.scalar(_KNOWLEDGE_BASE_COUNT_SQL)
+            if count > self.max_rows:
+                self._embeddings = None
+                self._categories = None
+                self._entries = []
+                self._by_text = {}
+            else:
+                rows = (await session.execute(_KNOWLEDGE_BASE_ROWS_SQL)).fetchall()
+                self._load(rows)
+        self._loaded_at = time.monotonic()
+
+    def _load(self, rows: list) -> None:
+        """Build the normalized embedding matrix from knowledge base rows.
+
+        Args:
+            rows: Rows with id, content, category, title, metadata and
+                embedding columns.
+        """
+        dimensions = settings.embedding_dimensions
+        embeddings = np.zeros((len(rows), dimensions), dtype=np.float32)
+        for index, row in enumerate(rows):
+            embeddings[index] = np.asarray(row.embedding, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        embeddings /= norms
+
+        self._embeddings = embeddings
+        self._categories = np.array([row.category for row in rows], dtype=object)
+        self._entries = [
+            RAGResult(
+                id=str(row.id),
+                content=row.content,
+                category=row.category,
+                title=row.title,
+                score=0.0,
+                metadata=row.metadata or {},
+            )
+            for row in rows
+        ]
+        # Content matches take precedence over title matches
+        by_text = {}
+        for index, row in enumerate(rows):
+            by_text.setdefault(_text_key(row.content), index)
+        for index, row in enumerate(rows):
+            if row.title:
+                by_text.setdefault(_text_key(row.title), index)
+        self._by_text = by_text
+
+
+def _text_key(text: str) -> str:
+    """Normalize text for exact matching against knowledge base entries."""
+    return " ".join(text.casefold().split())
+
+
+@lru_cache
+def get_knowledge_base_index() -> KnowledgeBaseIndex:
+    """Get the shared process-wide in-memory knowledge base index."""
+    return KnowledgeBaseIndex(
+        max_rows=settings.rag_local_index_max_rows,
+        max_age=settings.rag_local_index_max_age,
+    )
+
+
+def is_trivial_query(query: str) -> bool:
+    """Check whether a query is too short or generic to be worth searching.
+
+    Args:
+        query: Search query text.
+
+    Returns:
+        True for blank, very short or stopword-only queries.
+    """
+    words = [word.strip(_WORD_PUNCTUATION) for word in query.casefold().split()]
+    if sum(map(len, words)) < settings.rag_min_query_length:
+        return True
+    return all(not word or word in _STOPWORDS for word in words)
+
 
 class RAGService:
     """Service for RAG-based knowledge base retrieval."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, embedding_service: EmbeddingService | None = None):
         """Initialize RAG service.
 
         Args:
             db: Database session.
+            embedding_service: Service used to embed queries (defaults to the
+                shared service).
         """
         self.db = db
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = embedding_service or get_embedding_service()
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query.
+
+        Queries matching a knowledge base entry's content or title reuse the
+        entry's stored embedding, skipping the embeddings API.
+
+        Args:
+            query: Search query text.
+
+        Returns:
+            L2-normalized float32 query embedding.
+        """
+        embedding = await get_knowledge_base_index().embedding_for(query)
+        if embedding is not None:
+            return embedding
+
+        embedding = np.asarray(
+            await self.embedding_service.embed_for_search(query), dtype=np.float32
+        )
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
 
     async def search(
         self,
         query: str,
         category: str | None = None,
         limit: int | None = None,
+        query_embedding: list[float] | np.ndarray | None = None,
     ) -> list[RAGResult]:
         """Search knowledge base using vector similarity.
 
+        Small knowledge bases are searched in process. Otherwise searches go
+        through the shared batcher when it is running, and through this
+        service's session otherwise.
+
         Args:
             query: Search query text.
             category: Optional category filter (faq, policy, product, shipping).
             limit: Maximum number of results (defaults to settings.rag_top_k).
+            query_embedding: Precomputed query embedding (embeds query if None).
 
         Returns:
             List of RAGResult objects sorted by similarity score.
         """
         if limit is None:
             limit = settings.rag_top_k
+        if limit <= 0:
+            return []
 
         # Generate query embedding
-        query_embedding = await self.embedding_service.embed_for_search(query)
+        if query_embedding is None:
+            if is_trivial_query(query):
+                return []
+            query_embedding = await self.embed_query(query)
 
         # Build vector similarity search query
-        # Using cosine distance: 1 - cosine_distance gives similarity score
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
+        # Candidates come from the halfvec (fp16) index, then are reranked by
+        # full-precision inner product, which is cosine similarity for
+        # unit-length vectors
+        embedding = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm:
+            embedding = embedding / norm
+        results = await get_knowledge_base_index().search(embedding, category, limit)
+        if results is not None:
+            return results
+
+        results = await get_rag_search_batcher().search(embedding, category, limit)
+        if results is not None:
+            return results
+
+        candidates = limit * RERANK_CANDIDATE_FACTOR
+        await register_vector_codec(self.db)
 
         if category:
-            sql = text("""
-                SELECT
-                    id,
-                    content,
-                    category,
-                    title,
-                    metadata,
-                    1 - (embedding <=> CAST(:embedding AS vector)) as score
-                FROM knowledge_base
-                WHERE category = :category
-                    AND embedding IS NOT NULL
-                ORDER BY embedding <=> CAST(:embedding AS vector)
-                LIMIT :limit
-            """)
             result = await self.db.execute(
-                sql, {"embedding": embedding_str, "category": category, "limit": limit}
+                _SEARCH_BY_CATEGORY_SQL,
+                {
+                    "embedding": embedding,
+                    "category": category,
+                    "candidates": candidates,
+                    "limit": limit,
+                },
             )
         else:
-            sql = text("""
-                SELECT
-                    id,
-                    content,
-                    category,
-                    title,
-                    metadata,
-                    1 - (embedding <=> CAST(:embedding AS vector)) as score
-                FROM knowledge_base
-                WHERE embedding IS NOT NULL
-                ORDER BY embedding <=> CAST(:embedding AS vector)
-                LIMIT :limit
-            """)
             result = await self.db.execute(
-                sql, {"embedding": embedding_str, "limit": limit}
+                _SEARCH_SQL,
+                {"embedding": embedding, "candidates": candidates, "limit": limit},
             )
-        rows = result.fetchall()
-
-        return [
-            RAGResult(
-                id=str(row.id),
-                content=row.content,
-                category=row.category,
-                title=row.title,
-                score=float(row.score),
-                metadata=row.metadata or {},
-            )
-            for row in rows
-        ]
+        return [RAGResult.from_row(row) for row in result.fetchall()]
 
     async def search_with_threshold(
         self,
@@ -117,6 +546,7 @@ class RAGService:
         category: str | None = None,
         threshold: float | None = None,
         limit: int | None = None,
+        query_embedding: list[float] | np.ndarray | None = None,
     ) -> list[RAGResult]:
         """Search knowledge base with similarity threshold filtering.
 
@@ -125,6 +555,7 @@ class RAGService:
             category: Optional category filter.
             threshold: Minimum similarity score (defaults to settings.rag_similarity_threshold).
             limit: Maximum number of results.
+            query_embedding: Precomputed query embedding (embeds query if None).
 
         Returns:
             List of RAGResult objects above the threshold.
@@ -132,7 +563,9 @@ class RAGService:
         if threshold is None:
             threshold = settings.rag_similarity_threshold
 
-        results = await self.search(query, category=category, limit=limit)
+        results = await self.search(
+            query, category=category, limit=limit, query_embedding=query_embedding
+        )
         return [r for r in results if r.score >= threshold]
 
     async def get_by_id(self, kb_id: str) -> KnowledgeBase | None:
@@ -149,16 +582,22 @@ class RAGService:
         )
         return result.scalar_one_or_none()
 
-    async def get_by_category(self, category: str) -> list[KnowledgeBase]:
-        """Get all knowledge base entries in a category.
+    async def get_by_category(self, category: str) -> AsyncIterator[KnowledgeBase]:
+        """Stream all knowledge base entries in a category.
+
+        Rows are fetched from a server-side cursor in chunks rather than
+        loaded all at once.
 
         Args:
             category: Category name.
 
-        Returns:
-            List of KnowledgeBase models.
+        Yields:
+            KnowledgeBase models.
         """
-        result = await self.db.execute(
-            select(KnowledgeBase).where(KnowledgeBase.category == category)
+        result = await self.db.stream_scalars(
+            select(KnowledgeBase)
+            .where(KnowledgeBase.category == category)
+            .execution_options(yield_per=500)
         )
-        return list(result.scalars().all())
+        async for entry in result:
+            yield entry
@@ -0,0 +1,189 @@
+"""Semantic caches keyed by embedding similarity."""
+
+import time
+from functools import lru_cache
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+from support_agent.config import get_settings
+from support_agent.services.embedding import EmbeddingService, get_embedding_service
+
+T = TypeVar("T")
+
+# Rows upcast at a time when scoring an int8 matrix
+_SCAN_BLOCK_ROWS = 256
+
+
+class SemanticCache(Generic[T]):
+    """In-process cache of values keyed by text embedding.
+
+    Embeddings are stored L2-normalized in a fixed-size float32 matrix, so a
+    lookup is a single matrix-vector product. Each entry also carries an exact
+    match key (e.g. a category) that a hit must share. When full, the oldest
+    entry is overwritten.
+
+    With ``quantize`` set, embeddings are stored as int8 with a per-row scale,
+    cutting the matrix to a quarter of its float32 size. With ``max_age`` set,
+    entries older than that many seconds are ignored by lookups.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        dimensions: int = 1536,
+        embedding_service: EmbeddingService | None = None,
+        quantize: bool = False,
+        max_age: float | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached values (0 disables).
+            dimensions: Embedding vector size.
+            embedding_service: Service used to embed text.
+            quantize: Store embeddings as int8 instead of float32.
+            max_age: Seconds an entry stays valid (None keeps entries until
+                overwritten).
+        """
+        self.max_entries = max_entries
+        self.embedding_service = embedding_service or get_embedding_service()
+        self._embeddings = np.zeros(
+            (max_entries, dimensions), dtype=np.int8 if quantize else np.float32
+        )
+        self._scales = np.zeros(max_entries, dtype=np.float32) if quantize else None
+        self.max_age = max_age
+        self._added_at = np.zeros(max_entries, dtype=np.float64)
+        self._entries: list[tuple[str | None, T]] = []
+        self._next_slot = 0
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Embed text for cache lookup.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            L2-normalized float32 embedding.
+        """
+        embedding = np.asarray(
+            await self.embedding_service.embed_text(text),
+            dtype=np.float32,
+        )
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def lookup(self, embedding: np.ndarray, key: str | None) -> tuple[float, T] | None:
+        """Find the most similar cached value with the same key.
+
+        Args:
+            embedding: Normalized query embedding.
+            key: Exact match key the entry must share.
+
+        Returns:
+            Tuple of (cosine similarity, cached value), or None if no live
+            entry has the key.
+        """
+        if not self._entries:
+            return None
+
+        scores = self._scores(embedding)
+        if self.max_age is not None:
+            expired = self._added_at[: len(scores)] < time.monotonic() - self.max_age
+            scores[expired] = -np.inf
+        for index in np.argsort(scores)[::-1]:
+            if scores[index] == -np.inf:
+                break
+            entry_key, value = self._entries[index]
+            if entry_key == key:
+                return float(scores[index]), value
+        return None
+
+    def add(self, embedding: np.ndarray, key: str | None, value: T) -> None:
+        """Store a value for an embedding.
+
+        Args:
+            embedding: Normalized embedding.
+            key: Exact match key for the entry.
+            value: Value to cache.
+        """
+        if self.max_entries <= 0:
+            return
+        slot = self._next_slot
+        if self._scales is None:
+            self._embeddings[slot] = embedding
+        else:
+            scale = float(np.abs(embedding).max()) / 127 or 1.0
+            self._embeddings[slot] = np.rint(embedding / scale)
+            self._scales[slot] = scale
+        if slot < len(self._entries):
+            self._entries[slot] = (key, value)
+        else:
+            self._entries.append((key, value))
+        self._added_at[slot] = time.monotonic()
+        self._next_slot = (slot + 1) % self.max_entries
+
+    def _scores(self, embedding: np.ndarray) -> np.ndarray:
+        """Compute cosine similarity against every cached embedding.
+
+        Args:
+            embedding: Normalized query embedding.
+
+        Returns:
+            Similarity per cached entry.
+        """
+        count = len(self._entries)
+        if self._scales is None:
+            return self._embeddings[:count] @ embedding
+
+        # NumPy has no int8 matrix product, so upcast a block at a time to
+        # keep the temporary small
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, _SCAN_BLOCK_ROWS):
+            stop = min(start + _SCAN_BLOCK_ROWS, count)
+            scores[start:stop] = self._embeddings[start:stop].astype(np.float32) @ embedding
+        return scores * self._scales[:count]
+
+
+class SemanticResponseCache(SemanticCache[Any]):
+    """Cache of agent responses to near-duplicate emails.
+
+    Responses are personalised and may echo details from the email, so
+    entries are keyed by the normalized sender address. Values are the
+    agent's AgentResponse objects, left untyped here since the agent module
+    imports this one.
+    """
+
+    async def embed(self, subject: str, body: str) -> np.ndarray:
+        """Embed an email for cache lookup.
+
+        Args:
+            subject: Email subject.
+            body: Email body text.
+
+        Returns:
+            L2-normalized float32 embedding.
+        """
+        return await self.embed_text(f"{subject}\n{body}")
+
+
+@lru_cache
+def get_semantic_response_cache() -> SemanticResponseCache:
+    """Get the shared process-wide response cache."""
+    settings = get_settings()
+    return SemanticResponseCache(
+        max_entries=settings.semantic_cache_size,
+        dimensions=settings.embedding_dimensions,
+    )
+
+
+@lru_cache
+def get_search_result_cache() -> SemanticCache[dict]:
+    """Get the shared process-wide knowledge base search result cache."""
+    settings = get_settings()
+    return SemanticCache(
+        max_entries=settings.rag_cache_size,
+        dimensions=settings.embedding_dimensions,
+        quantize=True,
+        max_age=settings.rag_cache_ttl or None,
+    )
@@ -0,0 +1,6 @@
+"""Shared test configuration."""
+
+import os
+
+# Settings require an API key; tests never call the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
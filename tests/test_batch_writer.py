@@ -0,0 +1,130 @@
+"""Tests for the background batch writer."""
+
+import asyncio
+import logging
+
+import pytest
+
+from support_agent.integrations.database.models import InteractionLog
+from support_agent.services import batch_writer
+from support_agent.services.batch_writer import BatchWriter
+
+
+class FakeSession:
+    """Session recording inserted rows, optionally failing some inserts."""
+
+    def __init__(self, fail=lambda rows: False):
+        self.fail = fail
+        self.inserts: list[list[dict]] = []
+        self.committed: list[list[dict]] = []
+        self._pending: list[dict] = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        self._pending = []
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        self.inserts.append(rows)
+        if self.fail(rows):
+            raise RuntimeError("insert failed")
+        self._pending.extend(rows)
+
+    async def commit(self):
+        self.committed.append(self._pending)
+
+    @property
+    def written_ids(self) -> list[str]:
+        return [row["id"] for rows in self.committed for row in rows]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(batch_writer, "async_session_factory", session)
+    return session
+
+
+def rows(count: int) -> list[dict]:
+    return [{"id": f"row-{i}", "sender_email": "a@example.com"} for i in range(count)]
+
+
+async def test_stop_drains_queued_rows(session):
+    writer = BatchWriter(InteractionLog, batch_size=4, max_wait=10)
+    writer.start()
+    for row in rows(10):
+        assert writer.enqueue(row)
+
+    await writer.stop()
+
+    assert not writer.running
+    assert session.written_ids == [row["id"] for row in rows(10)]
+    assert [len(batch) for batch in session.inserts] == [4, 4, 2]
+
+
+async def test_partial_batch_is_written_after_max_wait(session):
+    writer = BatchWriter(InteractionLog, batch_size=100, max_wait=0.01)
+    writer.start()
+    try:
+        writer.enqueue(rows(1)[0])
+        await asyncio.sleep(0.1)
+        assert session.written_ids == ["row-0"]
+    finally:
+        await writer.stop()
+
+
+async def test_full_queue_rejects_rows(session):
+    writer = BatchWriter(InteractionLog, batch_size=10, max_wait=10, max_queue=2)
+    writer.start()
+    # The background task has not run yet, so nothing leaves the queue
+    assert writer.enqueue(rows(1)[0])
+    assert writer.enqueue(rows(1)[0])
+    assert not writer.enqueue(rows(1)[0])
+    await writer.stop()
+
+
+async def test_rows_are_refused_unless_running(session):
+    writer = BatchWriter(InteractionLog, batch_size=10, max_wait=10)
+    assert not writer.enqueue(rows(1)[0])
+
+    writer.start()
+    stopping = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0)
+    assert not writer.running
+    assert not writer.enqueue(rows(1)[0])
+    await stopping
+
+    assert session.written_ids == []
+
+
+async def test_stop_waits_for_room_in_a_full_queue(session):
+    writer = BatchWriter(InteractionLog, batch_size=2, max_wait=10, max_queue=2)
+    writer.start()
+    for row in rows(2):
+        writer.enqueue(row)
+
+    await asyncio.wait_for(writer.stop(), timeout=1)
+
+    assert session.written_ids == ["row-0", "row-1"]
+
+
+async def test_failed_batch_is_retried_row_by_row(monkeypatch, caplog):
+    session = FakeSession(fail=lambda batch: len(batch) > 1 or batch[0]["id"] == "row-1")
+    monkeypatch.setattr(batch_writer, "async_session_factory", session)
+    writer = BatchWriter(InteractionLog, batch_size=3, max_wait=10)
+    writer.start()
+    for row in rows(3):
+        writer.enqueue(row)
+
+    with caplog.at_level(logging.WARNING, logger=batch_writer.__name__):
+        await writer.stop()
+
+    assert session.written_ids == ["row-0", "row-2"]
+    dropped = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(dropped) == 1
+    assert "row-1" in dropped[0].getMessage()
@@ -0,0 +1,87 @@
+"""Tests for the keyword prefilter that skips the LLM classifier."""
+
+import pytest
+
+from support_agent.agent.classifier import Complexity, Intent, IntentClassifier
+
+
+@pytest.fixture
+def classifier() -> IntentClassifier:
+    return IntentClassifier(openai_client=object())
+
+
+@pytest.mark.parametrize(
+    ("subject", "body", "intent"),
+    [
+        ("Order", "Where is my order? It was due Monday.", Intent.ORDER_STATUS),
+        ("Question", "Can I get my order status please?", Intent.ORDER_STATUS),
+        ("Shipping", "Could you send me the tracking number?", Intent.SHIPPING_TRACKING),
+        ("Help", "I want to speak to a manager.", Intent.ESCALATION_REQUEST),
+        ("Refunds", "What is your refund policy?", Intent.POLICY_QUESTION),
+        ("Returns", "How does the return policy work for sale items?", Intent.POLICY_QUESTION),
+    ],
+)
+def test_unambiguous_emails_are_classified(classifier, subject, body, intent):
+    result = classifier.prefilter(subject, body)
+
+    assert result is not None
+    assert result.intent == intent
+
+
+def test_match_carries_rule_metadata(classifier):
+    result = classifier.prefilter("Hi", "Where's my package?")
+
+    assert result.complexity == Complexity.SIMPLE
+    assert result.requires_order_lookup
+    assert not result.requires_knowledge_base
+    assert result.suggested_tools == ["get_order", "get_customer_orders"]
+
+
+def test_subject_is_matched(classifier):
+    result = classifier.prefilter("Tracking number?", "Thanks in advance.")
+
+    assert result.intent == Intent.SHIPPING_TRACKING
+
+
+def test_matching_is_case_insensitive(classifier):
+    result = classifier.prefilter("", "WHERE IS MY ORDER")
+
+    assert result.intent == Intent.ORDER_STATUS
+
+
+def test_no_match_goes_to_llm(classifier):
+    assert classifier.prefilter("Hello", "Do you sell gift cards?") is None
+
+
+def test_several_intents_go_to_llm(classifier):
+    body = "Where is my order? Also, what is your return policy?"
+
+    assert classifier.prefilter("Questions", body) is None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "Where is my order? This is unacceptable.",
+        "Where is my order? I want a refund.",
+        "Tracking number please, or refund now.",
+    ],
+)
+def test_complaints_go_to_llm(classifier, body):
+    assert classifier.prefilter("Order", body) is None
+
+
+def test_escalation_is_kept_despite_complaint(classifier):
+    result = classifier.prefilter("Angry", "This is unacceptable, I want to talk to a human.")
+
+    assert result.intent == Intent.ESCALATION_REQUEST
+
+
+def test_suggested_tools_are_not_shared_with_rule(classifier):
+    result = classifier.prefilter("", "order status")
+    result.suggested_tools.append("search_knowledge_base")
+
+    assert classifier.prefilter("", "order status").suggested_tools == [
+        "get_order",
+        "get_customer_orders",
+    ]
@@ -0,0 +1,72 @@
+"""Tests for HTML stripping in the email parser."""
+
+import time
+
+import pytest
+
+from support_agent.integrations.email.parser import _STRIP_RE, strip_html
+
+
+def strip(html_content: str) -> str:
+    """Apply the tag-stripping regex alone, collapsing whitespace."""
+    return " ".join(_STRIP_RE.sub(" ", html_content).split())
+
+
+@pytest.mark.parametrize(
+    ("html_content", "expected"),
+    [
+        ("<p>Hello <b>there</b></p>", "Hello there"),
+        ("<script>alert('<p>x</p>')</script>Body", "Body"),
+        ("<SCRIPT type='text/javascript'>var a = 1 < 2;</SCRIPT>Body", "Body"),
+        ("<style>p { color: red; }</style>Body", "Body"),
+        ("Before<!-- a <b>comment</b> -- here -->After", "Before After"),
+        ("<script >x</script >Body", "Body"),
+        ("<br/>line<br />break", "line break"),
+    ],
+)
+def test_strip_re_removes_markup(html_content, expected):
+    assert strip(html_content) == expected
+
+
+@pytest.mark.parametrize(
+    "html_content",
+    [
+        "Text<script>never closed",
+        "Text<style>never closed",
+        "Text<!-- never closed",
+    ],
+)
+def test_unclosed_elements_run_to_end_of_input(html_content):
+    assert strip(html_content) == "Text"
+
+
+def test_unpaired_angle_bracket_is_kept():
+    assert strip("1 < 2 and 2 < 3") == "1 < 2 and 2 < 3"
+
+
+@pytest.mark.parametrize(
+    "html_content",
+    [
+        "<script>" + "<" * 50_000,
+        "<style>" + "</styl" * 10_000,
+        "<!--" + "-" * 50_000,
+        "<" * 50_000,
+    ],
+)
+def test_malformed_input_is_matched_in_linear_time(html_content):
+    start = time.perf_counter()
+    _STRIP_RE.sub(" ", html_content)
+
+    assert time.perf_counter() - start < 1.0
+
+
+def test_strip_html_decodes_entities():
+    assert strip_html("<p>Fish &amp; chips&nbsp;&lt;3</p>") == "Fish & chips <3"
+
+
+def test_strip_html_handles_long_bodies():
+    body = "<html><body>" + "<p>Hello</p>" * 1000 + "<script>x()</script></body></html>"
+
+    text = strip_html(body)
+
+    assert text.split() == ["Hello"] * 1000
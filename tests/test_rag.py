@@ -0,0 +1,229 @@
+"""Tests for the RAG service helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from support_agent.services import rag
+from support_agent.services.rag import RAGResult, RAGSearchBatcher, is_trivial_query
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "   ",
+        "ok",
+        "hi!",
+        "Thanks",
+        "Hi, thank you!",
+        "Can you do it?",
+        "Hello... and thanks",
+    ],
+)
+def test_trivial_queries(query):
+    assert is_trivial_query(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "refund policy",
+        "How do I return shoes?",
+        "Thanks, where is my parcel?",
+        "vat",
+        "gift cards",
+    ],
+)
+def test_substantive_queries(query):
+    assert not is_trivial_query(query)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeSession:
+    """Session answering batch searches with canned rows."""
+
+    def __init__(self, rows_for_batch):
+        self.rows_for_batch = rows_for_batch
+        self.batches = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, params):
+        size = sum(1 for name in params if name.startswith("limit_"))
+        self.batches.append(params)
+        return FakeResult(self.rows_for_batch(params, size))
+
+
+def search_row(query_index, entry_id, score, category="faq"):
+    return SimpleNamespace(
+        query_index=query_index,
+        id=entry_id,
+        content=f"content {entry_id}",
+        category=category,
+        title=None,
+        metadata=None,
+        score=score,
+    )
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    def install(rows_for_batch):
+        session = FakeSession(rows_for_batch)
+        monkeypatch.setattr(rag, "async_session_factory", session)
+
+        async def no_codec(session):
+            return None
+
+        monkeypatch.setattr(rag, "register_vector_codec", no_codec)
+        return session
+
+    return install
+
+
+async def test_batcher_maps_rows_to_their_searches(fake_session):
+    def rows_for_batch(params, size):
+        # Query 1 finds nothing
+        return [
+            search_row(0, "a", np.float32(0.9)),
+            search_row(0, "b", np.float32(0.7)),
+            search_row(2, "c", 0.8, category="policy"),
+        ]
+
+    session = fake_session(rows_for_batch)
+    batcher = RAGSearchBatcher(batch_size=8, max_wait=0.05)
+    batcher.start()
+    embedding = np.ones(4, dtype=np.float32)
+    try:
+        results = await asyncio.gather(
+            batcher.search(embedding, None, 2),
+            batcher.search(embedding, "", 3),
+            batcher.search(embedding, "policy", 1),
+        )
+    finally:
+        await batcher.stop()
+
+    assert len(session.batches) == 1
+    params = session.batches[0]
+    assert [params[f"limit_{i}"] for i in range(3)] == [2, 3, 1]
+    # Empty categories are sent as no filter
+    assert [params[f"category_{i}"] for i in range(3)] == [None, None, "policy"]
+
+    assert [[r.id for r in found] for found in results] == [["a", "b"], [], ["c"]]
+    first = results[0][0]
+    assert first == RAGResult(
+        id="a", content="content a", category="faq", title=None, score=first.score, metadata={}
+    )
+    assert type(first.score) is float
+    assert first.score == pytest.approx(0.9)
+
+
+async def test_batcher_splits_at_batch_size(fake_session):
+    session = fake_session(lambda params, size: [])
+    batcher = RAGSearchBatcher(batch_size=2, max_wait=0.05)
+    batcher.start()
+    embedding = np.ones(4, dtype=np.float32)
+    try:
+        await asyncio.gather(*(batcher.search(embedding, None, 1) for _ in range(5)))
+    finally:
+        await batcher.stop()
+
+    sizes = sorted(sum(1 for name in p if name.startswith("limit_")) for p in session.batches)
+    assert sizes == [1, 2, 2]
+
+
+async def test_batcher_fails_every_search_in_a_failed_batch(fake_session):
+    def rows_for_batch(params, size):
+        raise RuntimeError("database unavailable")
+
+    fake_session(rows_for_batch)
+    batcher = RAGSearchBatcher(batch_size=8, max_wait=0.05)
+    batcher.start()
+    embedding = np.ones(4, dtype=np.float32)
+    try:
+        results = await asyncio.gather(
+            batcher.search(embedding, None, 1),
+            batcher.search(embedding, None, 1),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_batcher_refuses_searches_once_stopping(fake_session):
+    session = fake_session(lambda params, size: [])
+    batcher = RAGSearchBatcher(batch_size=8, max_wait=0.05)
+    embedding = np.ones(4, dtype=np.float32)
+    assert await batcher.search(embedding, None, 1) is None
+
+    batcher.start()
+    stopping = asyncio.create_task(batcher.stop())
+    await asyncio.sleep(0)
+
+    # Queued behind the stop sentinel, this search would never be answered
+    assert not batcher.running
+    assert await asyncio.wait_for(batcher.search(embedding, None, 1), timeout=1) is None
+    await stopping
+    assert session.batches == []
+
+
+async def test_stopped_batcher_can_restart(fake_session):
+    fake_session(lambda params, size: [search_row(0, "a", 0.5)])
+    batcher = RAGSearchBatcher(batch_size=8, max_wait=0.01)
+    embedding = np.ones(4, dtype=np.float32)
+    batcher.start()
+    await batcher.stop()
+
+    batcher.start()
+    try:
+        results = await batcher.search(embedding, None, 1)
+    finally:
+        await batcher.stop()
+
+    assert [r.id for r in results] == ["a"]
+
+
+async def test_failed_background_reload_keeps_stale_index(monkeypatch, caplog):
+    embedding = np.zeros(rag.settings.embedding_dimensions, dtype=np.float32)
+    embedding[0] = 1.0
+    index = rag.KnowledgeBaseIndex(max_rows=10, max_age=60)
+    index._load([
+        SimpleNamespace(
+            id="a", content="Returns", category="policy", title=None, metadata=None,
+            embedding=embedding,
+        )
+    ])
+    index._loaded_at = rag.time.monotonic() - 120
+
+    async def failing_reload():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(index, "_reload", failing_reload)
+    with caplog.at_level("WARNING", logger=rag.__name__):
+        results = await index.search(embedding, None, 1)
+        await index._reload_task
+
+    # The stale copy answers while the reload runs, and survives its failure
+    assert [r.id for r in results] == ["a"]
+    assert index.active
+    assert "reload failed" in caplog.records[0].getMessage()
+    assert caplog.records[0].exc_info is not None
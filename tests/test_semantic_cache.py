@@ -0,0 +1,109 @@
+"""Tests for the embedding-keyed semantic cache."""
+
+import numpy as np
+import pytest
+
+from support_agent.services.semantic_cache import SemanticCache
+
+DIMENSIONS = 64
+
+
+def unit_vectors(count: int, seed: int = 0) -> np.ndarray:
+    """Random L2-normalized float32 vectors, one per row."""
+    vectors = np.random.default_rng(seed).standard_normal((count, DIMENSIONS))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def make_cache(**kwargs) -> SemanticCache[str]:
+    return SemanticCache(dimensions=DIMENSIONS, **kwargs)
+
+
+def test_lookup_returns_most_similar_entry():
+    cache = make_cache(max_entries=10)
+    vectors = unit_vectors(3)
+    for index, vector in enumerate(vectors):
+        cache.add(vector, None, f"value-{index}")
+
+    score, value = cache.lookup(vectors[1], None)
+
+    assert value == "value-1"
+    assert score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_lookup_on_empty_cache_returns_none():
+    assert make_cache(max_entries=10).lookup(unit_vectors(1)[0], None) is None
+
+
+def test_quantized_scores_track_float32_scores():
+    vectors = unit_vectors(50)
+    queries = unit_vectors(5, seed=1)
+    exact = make_cache(max_entries=50)
+    quantized = make_cache(max_entries=50, quantize=True)
+    for index, vector in enumerate(vectors):
+        exact.add(vector, None, str(index))
+        quantized.add(vector, None, str(index))
+
+    for query in queries:
+        np.testing.assert_allclose(quantized._scores(query), exact._scores(query), atol=0.02)
+
+
+def test_quantized_embeddings_are_stored_as_int8():
+    cache = make_cache(max_entries=4, quantize=True)
+    assert cache._embeddings.dtype == np.int8
+
+
+def test_full_cache_overwrites_oldest_entry():
+    cache = make_cache(max_entries=2)
+    vectors = unit_vectors(3)
+    for index, vector in enumerate(vectors):
+        cache.add(vector, None, f"value-{index}")
+
+    assert len(cache._entries) == 2
+    # The first entry's slot now holds the third
+    assert cache.lookup(vectors[0], None)[1] != "value-0"
+    assert cache.lookup(vectors[2], None)[1] == "value-2"
+    assert cache.lookup(vectors[1], None)[1] == "value-1"
+
+
+def test_expired_entries_are_ignored():
+    cache = make_cache(max_entries=4, max_age=60)
+    vectors = unit_vectors(2)
+    cache.add(vectors[0], None, "old")
+    cache.add(vectors[1], None, "new")
+    cache._added_at[0] -= 120
+
+    assert cache.lookup(vectors[0], None)[1] == "new"
+
+    cache._added_at[1] -= 120
+    assert cache.lookup(vectors[0], None) is None
+
+
+def test_entries_without_max_age_never_expire():
+    cache = make_cache(max_entries=4)
+    vector = unit_vectors(1)[0]
+    cache.add(vector, None, "value")
+    cache._added_at[0] -= 1e9
+
+    assert cache.lookup(vector, None)[1] == "value"
+
+
+def test_lookup_requires_matching_key():
+    cache = make_cache(max_entries=4)
+    vectors = unit_vectors(2)
+    cache.add(vectors[0], "faq", "faq-value")
+    cache.add(vectors[1], "policy", "policy-value")
+
+    # The closest entry has the wrong key, so the other one is returned
+    assert cache.lookup(vectors[0], "policy")[1] == "policy-value"
+    assert cache.lookup(vectors[0], "shipping") is None
+    assert cache.lookup(vectors[0], None) is None
+
+
+def test_zero_entries_disables_cache():
+    cache = make_cache(max_entries=0)
+    vector = unit_vectors(1)[0]
+
+    cache.add(vector, None, "value")
+
+    assert cache.lookup(vector, None) is None